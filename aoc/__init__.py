@@ -0,0 +1,6 @@
+'''
+Shared tooling for running, timing and feeding the `task_NN` solvers.
+
+Days import their helpers from here, so they are run as modules from the
+repository root, e.g. `python -m task_01.task`.
+'''
@@ -0,0 +1,73 @@
+'''
+Solves many inputs of the same day on a process pool.
+
+    python -m aoc.batch task_01 submissions/
+    python -m aoc.batch task_07 'submissions/*/day07.txt' --workers 16
+
+Inputs are files, directories (every file in them) or glob patterns. Results
+are printed as json lines in the order they complete, with the input path
+and the time it took. A failing input reports its error and does not stop
+the others.
+'''
+import argparse
+import glob
+import json
+import os
+import sys
+
+from typing import Iterable, Iterator, List, Optional
+
+from aoc.days import SOLVERS
+from aoc.runner import CACHE_DIR, as_record, solve_jobs
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    paths = []
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                entry.path for entry in os.scandir(pattern)
+                if entry.is_file() and not entry.name.startswith('.')
+            ]
+        else:
+            matches = glob.glob(pattern) or [pattern]
+        paths.extend(sorted(matches))
+
+    return paths
+
+
+def solve_batch(
+    day: str,
+    paths: List[str],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> Iterator[dict]:
+    '''
+    Yields the result of each input as soon as it is solved. An input that
+    takes its worker down only fails itself, see `aoc.runner.solve_jobs`.
+    '''
+    yield from solve_jobs([(day, path) for path in paths], workers, cache_dir=cache_dir)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('day', choices=sorted(SOLVERS))
+    parser.add_argument('inputs', nargs='+', help='input files, directories or glob patterns')
+    parser.add_argument('--workers', type=int, default=None, help='size of the process pool')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='where answers are cached (default: .aoc_cache)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore the answer cache')
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    failed = 0
+
+    for result in solve_batch(args.day, paths, args.workers, None if args.no_cache else args.cache_dir):
+        failed += result['error'] is not None
+        print(json.dumps({'input': result['input'], **as_record(result)}), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
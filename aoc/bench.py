@@ -0,0 +1,129 @@
+'''
+Times the phases of each day (see `aoc.days.run_phases`).
+
+    python -m aoc.bench task_01 task_08 --repeat 10
+    python -m aoc.bench --save bench_baseline.json
+    python -m aoc.bench --compare bench_baseline.json
+
+Every phase is run `--repeat` times and summarised as min/median/p95 seconds.
+With `--compare`, phases whose median got slower than the baseline by more
+than `--tolerance` are flagged and the exit status is non-zero.
+'''
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from aoc.days import SOLVERS, discover, run_phases
+
+
+# Phases quicker than this are all noise, don't flag them.
+MIN_REGRESSION_SECONDS = 0.001
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    # nearest-rank percentile, good enough for a handful of runs.
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def summarize(samples: List[float]) -> dict:
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'runs': len(samples),
+    }
+
+
+def bench_day(day: str, repeat: int, path: Optional[str] = None) -> Dict[str, dict]:
+    timings = defaultdict(list)
+
+    def timed(phase, func):
+        start = time.perf_counter()
+        result = func()
+        timings[phase].append(time.perf_counter() - start)
+        return result
+
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_phases(day, path, call=timed)
+
+    return {phase: summarize(samples) for phase, samples in timings.items()}
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+
+    for day, phases in results.items():
+        for phase, stats in phases.items():
+            try:
+                before = baseline[day][phase]['median']
+            except KeyError:
+                continue
+            after = stats['median']
+            if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_SECONDS:
+                regressions.append(f'{day} {phase}: {before:.4f}s -> {after:.4f}s')
+
+    return regressions
+
+
+def format_table(results: dict) -> str:
+    lines = [f"{'day':<8} {'phase':<8} {'min':>10} {'median':>10} {'p95':>10}"]
+    for day, phases in results.items():
+        for phase, s in phases.items():
+            lines.append(f"{day:<8} {phase:<8} {s['min']:>10.4f} {s['median']:>10.4f} {s['p95']:>10.4f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='*', help='days to benchmark (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per day')
+    parser.add_argument('--input', help='input file to use instead of input.txt (single day only)')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a json baseline')
+    parser.add_argument('--compare', metavar='PATH', help='json baseline to check against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed median slowdown (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    days = args.days or [d for d in discover() if d in SOLVERS]
+    if args.input and len(days) != 1:
+        parser.error('--input needs exactly one day')
+
+    results = {}
+    for day in days:
+        results[day] = bench_day(day, args.repeat, path=args.input)
+
+    print(format_table(results))
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            }, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as fp:
+            baseline = json.load(fp)['results']
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'[!] regression {line}')
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+'''
+On-disk cache of answers, keyed by day, part, solver source and input.
+
+Every answer is stored as a small json file named after the hash of its key.
+Changing a `task.py` changes its source hash, so stale answers are simply
+never looked up again and age out. The cache is kept under `max_entries` and
+`max_bytes` by evicting the least recently used files. Entries and bytes
+written are tallied as they go, so the directory is only scanned when that
+tally says it is over the limits, and it is then trimmed a bit further than
+needed for the next writes not to scan it again right away.
+'''
+import hashlib
+import json
+import os
+import tempfile
+
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+MAX_ENTRIES = 4096
+MAX_BYTES = 64 * 1024 * 1024
+# how full the cache is left after an eviction.
+LOW_WATER = 0.9
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        for block in iter(lambda: fp.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, root: str, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        # tally of what is in the cache: an overestimate, as overwritten
+        # entries and the writes of other processes are not told apart.
+        self._n_entries = None
+        self._n_bytes = None
+
+    def _path(self, day: str, part: Any, source_hash: str, input_hash: str) -> str:
+        key = json.dumps([day, part, source_hash, input_hash])
+        return os.path.join(self.root, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def get(self, day: str, part: Any, source_hash: str, input_hash: str) -> Tuple[bool, Any]:
+        '''Returns `(hit, answer)`.'''
+        path = self._path(day, part, source_hash, input_hash)
+        try:
+            with open(path, 'r') as fp:
+                answer = json.load(fp)['answer']
+        except (FileNotFoundError, ValueError, KeyError):
+            return False, None
+        # mark as recently used, unless another process evicted it meanwhile:
+        # the answer is already read either way.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, answer
+
+    def _write(self, day: str, part: Any, source_hash: str, input_hash: str, answer: Any):
+        path = self._path(day, part, source_hash, input_hash)
+        entry = json.dumps({'day': day, 'part': part, 'answer': answer})
+        # Workers may write at the same time, so entries are swapped in whole.
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(entry)
+        os.replace(tmp_path, path)
+
+        if self._n_entries is not None:
+            self._n_entries += 1
+            self._n_bytes += len(entry)
+
+    def put(self, day: str, part: Any, source_hash: str, input_hash: str, answer: Any):
+        self._write(day, part, source_hash, input_hash, answer)
+        self.maybe_evict()
+
+    def get_answers(self, day: str, source_hash: str, input_hash: str) -> Optional[List[Any]]:
+        '''Returns all the answers of a day, or None unless every part is cached.'''
+        hit, n_parts = self.get(day, 'parts', source_hash, input_hash)
+        if not hit:
+            return None
+
+        answers = []
+        for part in range(1, n_parts + 1):
+            hit, answer = self.get(day, part, source_hash, input_hash)
+            if not hit:
+                return None
+            answers.append(answer)
+        return answers
+
+    def put_answers(self, day: str, source_hash: str, input_hash: str, answers: Iterable[Any]):
+        answers = list(answers)
+        for part, answer in enumerate(answers, start=1):
+            self._write(day, part, source_hash, input_hash, answer)
+        # the part count goes last: it is what makes the day a hit.
+        self._write(day, 'parts', source_hash, input_hash, len(answers))
+        self.maybe_evict()
+
+    def maybe_evict(self):
+        '''Evicts, but only when the tally of entries and bytes is over the limits.'''
+        if self._n_entries is None or self._n_entries > self.max_entries or self._n_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        if len(entries) > self.max_entries or total > self.max_bytes:
+            max_entries = int(self.max_entries * LOW_WATER)
+            max_bytes = int(self.max_bytes * LOW_WATER)
+        else:
+            max_entries, max_bytes = self.max_entries, self.max_bytes
+
+        evicted = 0
+        while evicted < len(entries) and (len(entries) - evicted > max_entries or total > max_bytes):
+            _, size, path = entries[evicted]
+            evicted += 1
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # another worker got there first.
+                pass
+
+        self._n_entries = len(entries) - evicted
+        self._n_bytes = total
@@ -0,0 +1,153 @@
+'''Discovery and loading of the `task_NN/task.py` solvers.'''
+import glob
+import importlib.util
+import os
+import sys
+
+from functools import partial
+from itertools import count
+from types import ModuleType
+from typing import Any, Callable, Iterator, List, Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generator function of each day, along with the extra keyword arguments its
+# `__main__` block passes for the real input.
+SOLVERS = {
+    'task_01': ('grouped_max', {}),
+    'task_02': ('total_score', {}),
+    'task_03': ('priority_sum', {}),
+    'task_04': ('common_pairs', {}),
+    'task_05': ('stack_state', {}),
+    'task_06': ('packet_start', {}),
+    'task_07': ('fs_counter', {}),
+    'task_08': ('trees_count', {}),
+    'task_09': ('rope_motion', {}),
+    'task_10': ('sys_emulator', {}),
+    'task_11': ('monkey_biz', {}),
+    'task_12': ('shitty_signals', {}),
+    'task_13': ('packet_parity', {}),
+    'task_14': ('sandulator', {}),
+    'task_15': ('beacon_sensor', {'y': 2_000_000}),
+    'task_21': ('monkey_calculator', {}),
+    'task_22': ('monkeypass', {}),
+    'task_25': ('double_minus', {}),
+}
+
+# Days whose solver reads its input as a stream (see `aoc.streams`). They are
+# handed the open file instead of its content, and never hold all of it.
+STREAMING = {
+    'task_01', 'task_02', 'task_03', 'task_04', 'task_06', 'task_07', 'task_09', 'task_10', 'task_25',
+}
+
+
+def discover() -> List[str]:
+    '''Lists the days that have a `task.py`, in order.'''
+    paths = glob.glob(os.path.join(ROOT, 'task_[0-9][0-9]', 'task.py'))
+    return sorted(os.path.basename(os.path.dirname(p)) for p in paths)
+
+
+def task_path(day: str) -> str:
+    return os.path.join(ROOT, day, 'task.py')
+
+
+def input_path(day: str) -> str:
+    return os.path.join(ROOT, day, 'input.txt')
+
+
+def load_module(day: str):
+    # The task directories are not packages, so they are loaded by path. The
+    # module is registered under the day's name so that functions in it can be
+    # pickled for worker processes.
+    name = day
+    if name in sys.modules:
+        return sys.modules[name]
+    # days import `aoc` themselves, from the repository root.
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    spec = importlib.util.spec_from_file_location(name, task_path(day))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def source_files(day: str) -> List[str]:
+    '''
+    The day's `task.py` and the files of the `aoc` modules it uses, directly or
+    through other `aoc` modules: everything its answers depend on.
+    '''
+    files = {task_path(day)}
+    seen = set()
+    pending = [load_module(day)]
+
+    while pending:
+        module = pending.pop()
+        for value in vars(module).values():
+            name = value.__name__ if isinstance(value, ModuleType) else getattr(value, '__module__', None)
+            if not isinstance(name, str) or name.partition('.')[0] != 'aoc' or name in seen:
+                continue
+            seen.add(name)
+            dependency = sys.modules[name]
+            files.add(dependency.__file__)
+            pending.append(dependency)
+
+    return sorted(files)
+
+
+def load_solver(day: str) -> Callable[[str], Iterator]:
+    '''Returns the day's generator function, bound to its extra arguments.'''
+    if day not in SOLVERS:
+        raise KeyError(f'No solver registered for {day}.')
+    func_name, kwargs = SOLVERS[day]
+    func = getattr(load_module(day), func_name)
+    return partial(func, **kwargs)
+
+
+def read_input(path: str) -> str:
+    with open(path, 'r') as fp:
+        return fp.read()
+
+
+def run_phases(
+    day: str,
+    path: Optional[str] = None,
+    call: Callable = None,
+    results: Optional[List[Any]] = None,
+) -> List[Any]:
+    '''
+    Runs the day split in phases and returns its answers.
+
+    Days with a `solve(model)` next to their `parse_input` start with `parse`,
+    reading the input and building the model, then `part_N` pulls the next
+    answer off `solve(model)`. The other days start with `read`, which only
+    reads the input: their parsing happens lazily, within `part_1`.
+    Each phase goes through `call(phase, func)`, which must return `func()`.
+    Answers are appended to `results` (a new list by default) as they come,
+    so a caller keeping it still has them if a later part fails.
+    '''
+    call = call or (lambda phase, func: func())
+    module = load_module(day)
+    _, kwargs = SOLVERS[day]
+    path = path or input_path(day)
+
+    if hasattr(module, 'solve') and hasattr(module, 'parse_input'):
+        model = call('parse', lambda: module.parse_input(read_input(path)))
+        answers = module.solve(model, **kwargs)
+    else:
+        answers = load_solver(day)(call('read', partial(read_input, path)))
+
+    results = [] if results is None else results
+    for ix in count(1):
+        try:
+            results.append(call(f'part_{ix}', partial(next, answers)))
+        except StopIteration:
+            break
+
+    return results
@@ -0,0 +1,100 @@
+'''
+A dense 2D grid of small integers for the grid days.
+
+Cells hold a byte each (0..255) and live row-major in one flat `bytearray`,
+so a cell costs one byte and a lookup is a bit of index arithmetic instead of
+hashing a point. Rows and columns are handed out as `memoryview`s over the
+same buffer, no copies involved. With NumPy around, `as_numpy` gives a
+(rows, cols) array sharing the buffer too.
+'''
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+class Grid:
+    def __init__(self, n_rows: int, n_cols: int, fill: int = 0):
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.cells = bytearray([fill]) * (n_rows * n_cols)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], table: Optional[bytes] = None, fill: int = 0) -> 'Grid':
+        '''
+        Builds a grid from rows of text. Each character becomes its byte value,
+        mapped through `table` (see `bytes.maketrans`) when given. Short rows
+        are padded with `fill`.
+        '''
+        rows = [line.encode() for line in lines]
+        grid = cls(len(rows), max(map(len, rows), default=0), fill=fill)
+
+        for r, row in enumerate(rows):
+            if table is not None:
+                row = row.translate(table)
+            start = r * grid.n_cols
+            grid.cells[start:start + len(row)] = row
+
+        return grid
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    def index(self, r: int, c: int) -> int:
+        return r * self.n_cols + c
+
+    def position(self, ix: int) -> Tuple[int, int]:
+        return divmod(ix, self.n_cols)
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.n_rows and 0 <= c < self.n_cols
+
+    def __getitem__(self, key: Tuple[int, int]) -> int:
+        r, c = key
+        if not self.in_bounds(r, c):
+            raise IndexError(f'{key} is outside of the {self.n_rows}x{self.n_cols} grid')
+        return self.cells[r * self.n_cols + c]
+
+    def __setitem__(self, key: Tuple[int, int], value: int):
+        r, c = key
+        if not self.in_bounds(r, c):
+            raise IndexError(f'{key} is outside of the {self.n_rows}x{self.n_cols} grid')
+        self.cells[r * self.n_cols + c] = value
+
+    def get(self, r: int, c: int, default: Optional[int] = None) -> Optional[int]:
+        if not self.in_bounds(r, c):
+            return default
+        return self.cells[r * self.n_cols + c]
+
+    def row(self, r: int) -> memoryview:
+        start = r * self.n_cols
+        return memoryview(self.cells)[start:start + self.n_cols]
+
+    def col(self, c: int) -> memoryview:
+        return memoryview(self.cells)[c::self.n_cols]
+
+    def neighbors(self, ix: int) -> Iterator[int]:
+        '''Flat indexes of the cells up, down, left and right of `ix`.'''
+        n_cols = self.n_cols
+        r, c = divmod(ix, n_cols)
+        if r > 0:
+            yield ix - n_cols
+        if r < self.n_rows - 1:
+            yield ix + n_cols
+        if c > 0:
+            yield ix - 1
+        if c < n_cols - 1:
+            yield ix + 1
+
+    def find(self, value: int) -> Iterator[int]:
+        '''Flat indexes of the cells holding `value`.'''
+        ix = self.cells.find(value)
+        while ix != -1:
+            yield ix
+            ix = self.cells.find(value, ix + 1)
+
+    def as_numpy(self):
+        import numpy as np
+
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n_rows, self.n_cols)
+
+    def __repr__(self) -> str:
+        return f'Grid<{self.n_rows}x{self.n_cols}>'
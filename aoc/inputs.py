@@ -0,0 +1,449 @@
+'''
+Seeded generators of synthetic puzzle inputs, for inputs bigger than ours.
+
+    python -m aoc.inputs task_08 --size 1000 --seed 1 -o /tmp/trees.txt
+    python -m aoc.bench task_08 --input /tmp/trees.txt
+
+What `size` means depends on the day, see the generator docstrings. The same
+day, size and seed always produce the same file.
+'''
+import argparse
+import random
+import string
+import sys
+
+from typing import Callable, Dict, List
+
+
+GENERATORS: Dict[str, Callable[[int, random.Random], str]] = {}
+
+
+def generator(day: str):
+    def register(func):
+        GENERATORS[day] = func
+        return func
+    return register
+
+
+@generator('task_01')
+def calories(size: int, rng: random.Random) -> str:
+    '''`size` groups of 1 to 15 calorie counts.'''
+    groups = [
+        '\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(size)
+    ]
+    return '\n\n'.join(groups) + '\n'
+
+
+@generator('task_02')
+def strategy_guide(size: int, rng: random.Random) -> str:
+    '''`size` rounds.'''
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(size))
+
+
+@generator('task_03')
+def rucksacks(size: int, rng: random.Random) -> str:
+    '''`size` groups of three rucksacks, each with 2 to 40 items per half.'''
+    letters = string.ascii_letters
+    lines = []
+
+    for _ in range(size):
+        # Each elf of the group gets its own letters, so that only the badge is
+        # shared in the group, and only one item is shared between the halves.
+        pool = list(letters)
+        rng.shuffle(pool)
+        badge, pool = pool[0], pool[1:]
+
+        for elf in range(3):
+            own = pool[elf * 17:(elf + 1) * 17]
+            common, lhs_items, rhs_items = own[0], own[1:9], own[9:]
+            half = rng.randint(2, 40)
+
+            lhs = [common, badge] + rng.choices(lhs_items, k=half - 2)
+            rhs = [common] + rng.choices(rhs_items, k=half - 1)
+            rng.shuffle(lhs)
+            rng.shuffle(rhs)
+            lines.append(''.join(lhs + rhs))
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_04')
+def assignments(size: int, rng: random.Random) -> str:
+    '''`size` pairs of section ranges within 1..99.'''
+    def section():
+        a, b = sorted((rng.randint(1, 99), rng.randint(1, 99)))
+        return f'{a}-{b}'
+
+    return ''.join(f'{section()},{section()}\n' for _ in range(size))
+
+
+@generator('task_05')
+def crates(size: int, rng: random.Random) -> str:
+    '''Nine stacks with `size` crates overall, and `size` moves.'''
+    n_stacks = 9
+    heights = [1] * n_stacks
+    for _ in range(max(size - n_stacks, 0)):
+        heights[rng.randrange(n_stacks)] += 1
+
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(h)] for h in heights]
+    drawing = []
+    for level in range(max(heights) - 1, -1, -1):
+        row = [f'[{s[level]}]' if level < len(s) else '   ' for s in stacks]
+        drawing.append(' '.join(row))
+    drawing.append(' '.join(f' {i + 1} ' for i in range(n_stacks)))
+
+    # Moves never empty a stack, so that every stack has a top in the end.
+    moves = []
+    for _ in range(size):
+        movable = [i for i, h in enumerate(heights) if h > 1]
+        if not movable:
+            break
+        src = rng.choice(movable)
+        dest = rng.choice([i for i in range(n_stacks) if i != src])
+        count = rng.randint(1, min(heights[src] - 1, 30))
+        heights[src] -= count
+        heights[dest] += count
+        moves.append(f'move {count} from {src + 1} to {dest + 1}')
+
+    return '\n'.join(drawing) + '\n\n' + '\n'.join(moves) + '\n'
+
+
+@generator('task_06')
+def datastream(size: int, rng: random.Random) -> str:
+    '''`size` characters, with both markers right at the end.'''
+    noise = ''.join(rng.choice('abc') for _ in range(max(size - 14, 0)))
+    marker = ''.join(rng.sample(string.ascii_lowercase[3:], 14))
+    return noise + marker + '\n'
+
+
+@generator('task_07')
+def terminal_log(size: int, rng: random.Random) -> str:
+    '''A filesystem of `size` entries, explored depth first.'''
+    # keep the total under the disk size, but big enough to need a deletion.
+    budget = 60_000_000
+    max_file_size = max(2 * budget // max(size, 1), 1)
+    children: Dict[int, List] = {0: []}
+    n_dirs = 1
+
+    for entry in range(1, size):
+        parent = rng.randrange(n_dirs)
+        if rng.random() < 0.2:
+            children[parent].append(('dir', f'd{entry}', n_dirs))
+            children[n_dirs] = []
+            n_dirs += 1
+        else:
+            ext = rng.choice(['', '.txt', '.dat', '.log'])
+            file_size = min(rng.randint(1, max_file_size), max(budget, 1))
+            budget -= file_size
+            children[parent].append((file_size, f'f{entry}{ext}', None))
+
+    lines = ['$ cd /']
+    # iterative dfs, a deep tree would overflow the recursion limit.
+    pending = [('ls', 0)]
+    while pending:
+        action, arg = pending.pop()
+        if action == 'up':
+            lines.append('$ cd ..')
+        elif action == 'cd':
+            lines.append(f'$ cd {arg}')
+        else:
+            lines.append('$ ls')
+            for kind, name, _ in children[arg]:
+                lines.append(f'{kind} {name}')
+            for kind, name, child in reversed(children[arg]):
+                if child is not None:
+                    pending += [('up', None), ('ls', child), ('cd', name)]
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_08')
+def tree_grid(size: int, rng: random.Random) -> str:
+    '''A `size` x `size` grid of tree heights.'''
+    return ''.join(
+        ''.join(rng.choice(string.digits) for _ in range(size)) + '\n'
+        for _ in range(size)
+    )
+
+
+@generator('task_09')
+def rope_moves(size: int, rng: random.Random) -> str:
+    '''`size` moves of 1 to 20 steps.'''
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 20)}\n' for _ in range(size))
+
+
+@generator('task_10')
+def cpu_program(size: int, rng: random.Random) -> str:
+    '''`size` instructions.'''
+    lines = []
+    for _ in range(size):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            lines.append(f'addx {rng.randint(-20, 20)}')
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_11')
+def monkeys(size: int, rng: random.Random) -> str:
+    '''Eight monkeys holding `size` items between them, one of them squaring.'''
+    n_monkeys = 8
+    divisors = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], n_monkeys)
+    items = [[rng.randint(50, 99)] for _ in range(n_monkeys)]
+    for _ in range(max(size - n_monkeys, 0)):
+        items[rng.randrange(n_monkeys)].append(rng.randint(50, 99))
+
+    # One monkey squares, like in the puzzle, and only one other monkey throws
+    # to it, when its item is divisible by the largest divisor. Part 1 never
+    # takes the worry levels modulo anything, so items that keep coming back
+    # to be squared would grow without end.
+    squaring, feeder = rng.sample(range(n_monkeys), 2)
+    largest = divisors.index(max(divisors))
+    divisors[feeder], divisors[largest] = divisors[largest], divisors[feeder]
+
+    blocks = []
+    for ix in range(n_monkeys):
+        if ix == squaring:
+            operation = 'old * old'
+        elif ix == feeder:
+            # a multiple of its divisor would send it every item.
+            operation = f'old + {rng.randint(1, 8)}'
+        else:
+            operation = rng.choice([
+                f'old * {rng.randint(2, 19)}',
+                f'old + {rng.randint(1, 8)}',
+            ])
+        if ix == feeder:
+            dest_true = squaring
+            dest_false = rng.choice([i for i in range(n_monkeys) if i not in (ix, squaring)])
+        elif ix == squaring:
+            dest_true, dest_false = rng.sample([i for i in range(n_monkeys) if i != ix], 2)
+        else:
+            dest_true, dest_false = rng.sample([i for i in range(n_monkeys) if i not in (ix, squaring)], 2)
+        blocks.append('\n'.join([
+            f'Monkey {ix}:',
+            f'  Starting items: {", ".join(map(str, items[ix]))}',
+            f'  Operation: new = {operation}',
+            f'  Test: divisible by {divisors[ix]}',
+            f'    If true: throw to monkey {dest_true}',
+            f'    If false: throw to monkey {dest_false}',
+        ]))
+
+    return '\n\n'.join(blocks) + '\n'
+
+
+@generator('task_12')
+def heightmap(size: int, rng: random.Random) -> str:
+    '''A `size` x `size` heightmap (at least 14 wide) rising from S to E.'''
+    size = max(size, 14)
+    span = 2 * (size - 1)
+    rows = []
+
+    for x in range(size):
+        row = []
+        for y in range(size):
+            # The slope climbs at most one step per cell. Random pits are kept
+            # off the first row and the last column, which are always a path.
+            height = (x + y) * 25 // span
+            if x > 0 and y < size - 1 and rng.random() < 0.1:
+                height = rng.randint(0, height)
+            row.append(string.ascii_lowercase[height])
+        rows.append(row)
+
+    rows[0][0] = 'S'
+    rows[-1][-1] = 'E'
+    return ''.join(''.join(row) + '\n' for row in rows)
+
+
+@generator('task_13')
+def packets(size: int, rng: random.Random) -> str:
+    '''`size` pairs of packets.'''
+    def packet(depth=0):
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                items.append(packet(depth + 1))
+            else:
+                items.append(str(rng.randint(0, 10)))
+        return '[' + ','.join(items) + ']'
+
+    return '\n\n'.join(f'{packet()}\n{packet()}' for _ in range(size)) + '\n'
+
+
+@generator('task_14')
+def rock_paths(size: int, rng: random.Random) -> str:
+    '''`size` rock paths below the sand source.'''
+    spread = 10 + size // 2
+    # Rocks start deeper than they are wide, so the sand can never pile up to
+    # the source in part 1 and always finds a way into the abyss.
+    top = spread + 2
+    bottom = top + 10 + size // 4
+    lines = []
+
+    for _ in range(size):
+        x, y = rng.randint(500 - spread, 500 + spread), rng.randint(top, bottom)
+        points = [f'{x},{y}']
+        for _ in range(rng.randint(1, 4)):
+            if rng.random() < 0.5:
+                x = rng.randint(max(x - 8, 500 - spread), min(x + 8, 500 + spread))
+            else:
+                y = rng.randint(max(y - 8, top), min(y + 8, bottom))
+            points.append(f'{x},{y}')
+        lines.append(' -> '.join(points))
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_15')
+def sensors(size: int, rng: random.Random) -> str:
+    '''About `size` sensors (at least 45), leaving one distress beacon uncovered.'''
+    rmax = 4_000_000
+    radius = rmax // 4
+    lines = []
+
+    def add(sx, sy, r):
+        # the closest beacon sits on the edge of the sensor's range.
+        lines.append(f'Sensor at x={sx}, y={sy}: closest beacon is at x={sx + r}, y={sy}')
+
+    # Diamonds centred on a checkerboard lattice tile the plane. The distress
+    # beacon takes the place of one of them, and the area around it is covered
+    # by four larger diamonds sitting diagonally from it, which reach anything
+    # but the beacon itself.
+    ox, oy = rng.randrange(radius), rng.randrange(radius)
+    i, j = rng.choice([(1, 1), (1, 3), (2, 2), (3, 1), (3, 3)])
+    bx, by = ox + i * radius, oy + j * radius
+
+    for i in range(-2, 7):
+        for j in range(-2, 7):
+            x, y = ox + i * radius, oy + j * radius
+            if (i + j) % 2 == 0 and (x, y) != (bx, by):
+                add(x, y, radius)
+    for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
+        add(bx + dx * radius, by + dy * radius, 2 * radius - 1)
+
+    # The rest are smaller and never reach the distress beacon.
+    for _ in range(max(size - len(lines), 0)):
+        sx, sy = rng.randint(0, rmax), rng.randint(0, rmax)
+        distance = abs(sx - bx) + abs(sy - by)
+        add(sx, sy, rng.randint(0, min(distance - 1, 100_000)))
+
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_21')
+def monkey_math(size: int, rng: random.Random) -> str:
+    '''About `size` monkeys yelling integers; `root` adds two of them.'''
+    names = set()
+
+    def name():
+        while True:
+            n = ''.join(rng.choices(string.ascii_lowercase, k=4 if size < 100_000 else 6))
+            if n not in names and n not in ('root', 'humn'):
+                names.add(n)
+                return n
+
+    lines = []
+    # (name, value, monkeys left to spend on the subtree)
+    pending = []
+    humn_placed = False
+
+    for _ in range(2):
+        pending.append((name(), rng.randint(1, 10_000), max(size - 1, 2) // 2))
+    lines.append(f'root: {pending[0][0]} + {pending[1][0]}')
+
+    while pending:
+        monkey, value, budget = pending.pop()
+        if budget <= 1:
+            if not humn_placed:
+                # humn yells at the first leaf, its value only has to keep the
+                # arithmetic of part 1 exact.
+                humn_placed = True
+                other = name()
+                lines.append(f'{monkey}: humn + {other}')
+                lines.append(f'humn: {value // 2}')
+                lines.append(f'{other}: {value - value // 2}')
+            else:
+                lines.append(f'{monkey}: {value}')
+            continue
+
+        # Only exact operations keep the floats in part 1 honest.
+        op = rng.choice('+-*/' if abs(value) < 1_000_000 else '+-')
+        if op == '+':
+            lhs = rng.randint(-1000, 1000)
+            rhs = value - lhs
+        elif op == '-':
+            rhs = rng.randint(-1000, 1000)
+            lhs = value + rhs
+        elif op == '*':
+            factors = [f for f in (2, 3, 5, 7) if value % f == 0]
+            if not factors:
+                op, lhs, rhs = '+', value - 1, 1
+            else:
+                rhs = rng.choice(factors)
+                lhs = value // rhs
+        else:
+            rhs = rng.randint(2, 5)
+            lhs = value * rhs
+
+        a, b = name(), name()
+        lines.append(f'{monkey}: {a} {op} {b}')
+        rest = budget - 1
+        pending.append((b, rhs, rest // 2))
+        pending.append((a, lhs, rest - rest // 2))
+
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+
+@generator('task_22')
+def monkey_map(size: int, rng: random.Random) -> str:
+    '''A `size` x `size` board and a path of `size` instructions.'''
+    rows = [
+        [('#' if rng.random() < 0.1 else '.') for _ in range(size)]
+        for _ in range(size)
+    ]
+    rows[0][0] = '.'
+    steps = [str(rng.randint(1, 2 * size))]
+    for _ in range(size):
+        steps.append(rng.choice('RL'))
+        steps.append(str(rng.randint(1, 2 * size)))
+
+    return '\n'.join(''.join(row) for row in rows) + '\n\n' + ''.join(steps) + '\n'
+
+
+@generator('task_25')
+def snafu_numbers(size: int, rng: random.Random) -> str:
+    '''`size` SNAFU numbers of up to 20 digits.'''
+    def number():
+        return rng.choice('12') + ''.join(rng.choices('=-012', k=rng.randint(0, 19)))
+
+    return ''.join(number() + '\n' for _ in range(size))
+
+
+def generate(day: str, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, random.Random(seed))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('day', choices=sorted(GENERATORS))
+    parser.add_argument('--size', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='file to write (default: stdout)')
+    args = parser.parse_args(argv)
+
+    data = generate(args.day, args.size, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            fp.write(data)
+    else:
+        sys.stdout.write(data)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+'''
+Opt-in cProfile and tracemalloc capture of each phase of a day.
+
+    python -m aoc.profiling task_14 --out prof/
+    AOC_PROFILE=prof/ python -m aoc.runner task_14
+
+For every phase (see `aoc.days.run_phases`) this writes `<day>.<phase>.prof`,
+to be opened with `pstats` or snakeviz, and `<day>.<phase>.alloc.txt` with the
+top allocation sites and the peak traced memory of the phase.
+'''
+import argparse
+import cProfile
+import os
+import sys
+import tracemalloc
+
+from typing import Any, List, Optional
+
+from aoc.days import SOLVERS, run_phases
+
+
+ENV_VAR = 'AOC_PROFILE'
+
+
+def allocation_report(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [f'peak traced memory: {peak / 1024:.1f} KiB', f'top {top} allocation sites:']
+    for stat in snapshot.statistics('lineno')[:top]:
+        frame = stat.traceback[0]
+        lines.append(f'{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {frame.filename}:{frame.lineno}')
+    return '\n'.join(lines) + '\n'
+
+
+def profile_day(
+    day: str,
+    out_dir: str,
+    path: Optional[str] = None,
+    top: int = 10,
+    results: Optional[List[Any]] = None,
+) -> List[Any]:
+    '''Runs the day with every phase profiled, and returns its answers (see `run_phases`).'''
+    os.makedirs(out_dir, exist_ok=True)
+
+    def profiled(phase, func):
+        prefix = os.path.join(out_dir, f'{day}.{phase}')
+        profiler = cProfile.Profile()
+
+        tracemalloc.start()
+        try:
+            result = profiler.runcall(func)
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        profiler.dump_stats(prefix + '.prof')
+        # keep the report about the solver, not about tracemalloc itself.
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        with open(prefix + '.alloc.txt', 'w') as fp:
+            fp.write(allocation_report(snapshot, peak, top))
+        return result
+
+    return run_phases(day, path, call=profiled, results=results)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='+', choices=sorted(SOLVERS), metavar='day')
+    parser.add_argument('--out', default=os.environ.get(ENV_VAR, 'prof'), help='where to write the reports')
+    parser.add_argument('--input', help='input file to use instead of input.txt (single day only)')
+    parser.add_argument('--top', type=int, default=10, help='allocation sites to report per phase')
+    args = parser.parse_args(argv)
+
+    if args.input and len(args.days) != 1:
+        parser.error('--input needs exactly one day')
+
+    for day in args.days:
+        answers = profile_day(day, args.out, path=args.input, top=args.top)
+        for ix, answer in enumerate(answers):
+            print(f'{day} answer_{ix + 1}={answer}')
+    print(f'reports written to {args.out}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+'''
+Runs several days at once on a process pool.
+
+    python -m aoc.runner                    # every day
+    python -m aoc.runner task_12 task_14    # just these
+    python -m aoc.runner --json
+
+Answers are cached on disk by input and solver source (see `aoc.cache`), so
+re-running unchanged days on the same inputs is instant. Use `--no-cache` to
+solve everything from scratch. Days that print a `[!]` warning are reported
+with it and not cached.
+
+With `--profile DIR` (or `AOC_PROFILE=DIR`) every phase of the days is run
+under cProfile and tracemalloc, see `aoc.profiling`. Profiled runs skip the
+cache lookup, there would be nothing to profile otherwise.
+'''
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from aoc.cache import AnswerCache, file_digest, text_digest
+from aoc.days import ROOT, SOLVERS, STREAMING, discover, input_path, load_solver, source_files
+from aoc.profiling import ENV_VAR as PROFILE_ENV_VAR, profile_day
+
+
+CACHE_DIR = os.path.join(ROOT, '.aoc_cache')
+
+
+@lru_cache(maxsize=None)
+def open_cache(root: str) -> AnswerCache:
+    # one per process, so that it keeps track of the cache size between days.
+    return AnswerCache(root)
+
+
+def solve_day(
+    day: str,
+    path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> dict:
+    '''Solves a single day and returns its answers. Runs in the workers.'''
+    path = path or input_path(day)
+    result = {
+        'day': day, 'input': path, 'answers': [], 'elapsed': None, 'error': None, 'cached': False, 'warnings': [],
+    }
+
+    start = time.perf_counter()
+    try:
+        if cache_dir:
+            cache = open_cache(cache_dir)
+            # the helpers from `aoc` and extra solver arguments are part of what
+            # gets solved too.
+            sources = [file_digest(p) for p in source_files(day)]
+            source_hash = text_digest(repr((sources, sorted(SOLVERS[day][1].items()))))
+            input_hash = file_digest(path)
+            answers = None if profile_dir else cache.get_answers(day, source_hash, input_hash)
+            if answers is not None:
+                result['answers'] = answers
+                result['cached'] = True
+                return result
+
+        # Solvers like to chat ("this will take a while..."), which would end
+        # up interleaved with the report, so it is swallowed here, all but
+        # their warnings.
+        # Answers are kept as they come, so that a failing part still reports
+        # the ones before it.
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if profile_dir:
+                profile_day(day, profile_dir, path=path, results=result['answers'])
+            else:
+                with open(path, 'r') as fp:
+                    data = fp if day in STREAMING else fp.read()
+                    result['answers'].extend(load_solver(day)(data))
+
+        # A warning means some answer is a stand-in (say, an optional package
+        # is missing), which must not be served from the cache later on.
+        result['warnings'] = [line for line in output.getvalue().splitlines() if line.startswith('[!]')]
+        if cache_dir and not result['warnings']:
+            cache.put_answers(day, source_hash, input_hash, result['answers'])
+    except Exception:
+        result['error'] = traceback.format_exc()
+    finally:
+        result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+def failed(day: str, path: str, error: str) -> dict:
+    # what `solve_day` would have returned, had its worker survived.
+    return {
+        'day': day, 'input': path, 'answers': [], 'elapsed': None, 'error': error, 'cached': False, 'warnings': [],
+    }
+
+
+def solve_jobs(
+    jobs: List[Tuple[str, str]],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> Iterator[dict]:
+    '''
+    Solves `(day, input path)` jobs on a process pool, yielding each result
+    as soon as it is done.
+
+    A job that takes its worker down (out of memory, a crash...) breaks the
+    whole pool, and every job not done yet fails with it. The first of those,
+    which were handed to workers and may be the culprit, are run again one at
+    a time in a pool of their own: only the culprit gets an error. The others,
+    which never started, go on in a new pool.
+    '''
+    workers = workers or os.cpu_count() or 1
+    order = {job: ix for ix, job in enumerate(jobs)}
+    pending = list(jobs)
+
+    def submit(pool, job):
+        day, path = job
+        return pool.submit(solve_day, day, path, cache_dir=cache_dir, profile_dir=profile_dir)
+
+    while pending:
+        broken = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {submit(pool, job): job for job in pending}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken.append(futures[future])
+                except Exception:
+                    yield failed(*futures[future], traceback.format_exc())
+
+        # a worker runs one job, and the pool queues one more ahead.
+        broken.sort(key=order.get)
+        suspects, pending = broken[:workers + 1], broken[workers + 1:]
+
+        for job in suspects:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                try:
+                    yield submit(pool, job).result()
+                except Exception:
+                    yield failed(*job, traceback.format_exc())
+
+
+def run_days(
+    days: List[str],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> List[dict]:
+    results = {}
+
+    jobs = [(day, input_path(day)) for day in days]
+    for result in solve_jobs(jobs, workers, cache_dir=cache_dir, profile_dir=profile_dir):
+        results[result['day']] = result
+
+    return [results[day] for day in days]
+
+
+def format_text(results: List[dict]) -> str:
+    lines = []
+    for result in results:
+        cached = ', cached' if result['cached'] else ''
+        # a day whose worker died has no time of its own.
+        elapsed = '?' if result['elapsed'] is None else f"{result['elapsed']:.2f}"
+        lines.append(f"{result['day']} ({elapsed}s{cached})")
+        if result['error']:
+            lines.append(result['error'].rstrip())
+        lines.extend(result['warnings'])
+        for ix, answer in enumerate(result['answers']):
+            lines.append(f'answer_{ix + 1}={answer}')
+    return '\n'.join(lines)
+
+
+def as_record(result: dict) -> dict:
+    '''Flattens a result of `solve_day` into what gets reported as json.'''
+    return {
+        'day': result['day'],
+        **{f'answer_{ix + 1}': answer for ix, answer in enumerate(result['answers'])},
+        'elapsed': result['elapsed'],
+        'cached': result['cached'],
+        'error': result['error'],
+        'warnings': result['warnings'],
+    }
+
+
+def format_json(results: List[dict]) -> str:
+    return json.dumps([as_record(r) for r in results], indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='*', help='days to run, e.g. task_01 (default: all)')
+    parser.add_argument('--json', action='store_true', help='print results as json')
+    parser.add_argument('--workers', type=int, default=None, help='size of the process pool')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='where answers are cached (default: .aoc_cache)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore the answer cache')
+    parser.add_argument('--profile', metavar='DIR', default=os.environ.get(PROFILE_ENV_VAR),
+                        help=f'write per-phase profiles to DIR (default: ${PROFILE_ENV_VAR})')
+    args = parser.parse_args(argv)
+
+    days = args.days or [d for d in discover() if d in SOLVERS]
+    unknown = [d for d in days if d not in SOLVERS]
+    if unknown:
+        parser.error(f'unknown days: {", ".join(unknown)}')
+
+    results = run_days(
+        days,
+        workers=args.workers or min(len(days), os.cpu_count() or 1),
+        cache_dir=None if args.no_cache else args.cache_dir,
+        profile_dir=args.profile,
+    )
+    print(format_json(results) if args.json else format_text(results))
+
+    return 1 if any(r['error'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
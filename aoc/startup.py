@@ -0,0 +1,99 @@
+'''
+Checks what loading each day costs in a fresh interpreter.
+
+    python -m aoc.startup
+    python -m aoc.startup task_15 --budget-ms 20
+
+Each day is loaded in its own `python -X importtime` process. The time to
+load its `task.py` is compared to the budget, and the heaviest imports it
+triggered are listed, so a top-level import of a big library shows up here
+instead of in every run of the multi-day runner.
+'''
+import argparse
+import subprocess
+import sys
+
+from typing import List, NamedTuple, Tuple
+
+from aoc.days import ROOT, SOLVERS, discover
+
+
+BUDGET_MS = 50.0
+MARKER = '-- loading day --'
+
+LOADER = f'''\
+import sys, time
+sys.path.insert(0, {ROOT!r})
+from aoc.days import load_module
+sys.stderr.write({MARKER!r} + '\\n')
+start = time.perf_counter()
+load_module(sys.argv[1])
+print((time.perf_counter() - start) * 1000)
+'''
+
+
+class StartupCost(NamedTuple):
+    day: str
+    load_ms: float
+    imports: List[Tuple[float, str]]   # (cumulative ms, module), heaviest first
+
+
+def parse_importtime(stderr: str) -> List[Tuple[float, str]]:
+    # Only the modules imported by the day itself, not the ones of the loader.
+    _, _, report = stderr.partition(MARKER)
+    imports = []
+
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if name.startswith('  '):
+            # nested import, already accounted for in its parent.
+            continue
+        try:
+            imports.append((int(cumulative) / 1000, name.strip()))
+        except ValueError:
+            # the header line.
+            continue
+
+    return sorted(imports, reverse=True)
+
+
+def measure(day: str) -> StartupCost:
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', LOADER, day],
+        capture_output=True, text=True, check=True,
+    )
+    return StartupCost(day, float(proc.stdout), parse_importtime(proc.stderr))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', nargs='*', help='days to check (default: all)')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS, help=f'per day (default: {BUDGET_MS})')
+    parser.add_argument('--top', type=int, default=3, help='heaviest imports to list per day')
+    args = parser.parse_args(argv)
+
+    days = args.days or [d for d in discover() if d in SOLVERS]
+    over_budget = []
+
+    for day in days:
+        try:
+            cost = measure(day)
+        except subprocess.CalledProcessError as err:
+            print(f'{day}: failed to load\n{err.stderr.strip().splitlines()[-1]}')
+            over_budget.append(day)
+            continue
+
+        flag = '  [!] over budget' if cost.load_ms > args.budget_ms else ''
+        print(f'{day}: {cost.load_ms:.1f} ms{flag}')
+        for ms, name in cost.imports[:args.top]:
+            print(f'    {ms:8.1f} ms  {name}')
+        if flag:
+            over_budget.append(day)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+'''Helpers to feed solvers from a string, a file, or any iterable of lines.'''
+from typing import Iterable, Iterator, Union
+
+
+InputT = Union[str, Iterable[str]]
+
+
+def iter_lines(data: InputT) -> Iterator[str]:
+    '''
+    Yields the lines of `data` without line endings, like `str.splitlines`,
+    but lazily. `data` is the whole input as a string, or anything yielding
+    lines, like an open file.
+    '''
+    if not isinstance(data, str):
+        for line in data:
+            yield line.rstrip('\r\n')
+        return
+
+    # Walk the string instead of splitting it, so that there is never a second
+    # full copy of the input around.
+    start = 0
+    while True:
+        end = data.find('\n', start)
+        if end == -1:
+            break
+        yield data[start:end].rstrip('\r')
+        start = end + 1
+    if start < len(data):
+        yield data[start:]
+
+
+def iter_blocks(data: InputT, size: int = 1 << 16) -> Iterator[str]:
+    '''
+    Yields `data` in pieces: a string as is, a file `size` characters at a
+    time, and any other iterable item by item.
+    '''
+    if isinstance(data, str):
+        yield data
+    elif hasattr(data, 'read'):
+        while True:
+            block = data.read(size)
+            if not block:
+                break
+            yield block
+    else:
+        yield from data
@@ -1,5 +1,15 @@
+import heapq
 import os
 
+from itertools import chain
+from typing import TYPE_CHECKING, AnyStr, Iterable, List, Optional, Tuple
+
+from aoc.streams import InputT, iter_lines
+
+if TYPE_CHECKING:
+    # only the mmap mode needs it, imported there to keep loading the day cheap.
+    import mmap
+
 __here__ = os.path.dirname(__file__)
 
 TEST_DATA = '''\
@@ -20,35 +30,116 @@ TEST_DATA = '''\
 '''
 
 
-def grouped_max(data):
-    groups = []
-    group = []
+def top_groups(lines: Iterable[AnyStr], k: int) -> List[int]:
+    '''
+    The `k` largest group sums, in no particular order. Only those are kept
+    around (as a min-heap), not every group of the log.
+    '''
+    if k < 1:
+        raise ValueError('k must be at least 1')
+    top = []
+    group = 0
 
-    for line in data.splitlines():
-        if line == '':
-            groups.append(sum(group))
-            group = []
+    # the trailing blank line closes the last group.
+    for line in chain(lines, ('',)):
+        if not line:
+            if len(top) < k:
+                heapq.heappush(top, group)
+            elif group > top[0]:
+                heapq.heapreplace(top, group)
+            group = 0
             continue
-        group.append(int(line))
-    # Last group
-    groups.append(sum(group))
+        group += int(line)
+
+    return top
+
+
+def grouped_max(data: InputT, k: int = 3):
+    top = top_groups(iter_lines(data), k)
+
+    # Top elf
+    yield max(top)
+
+    # Top k elves
+    yield sum(top)
+
+
+def split_groups(buf: 'mmap.mmap', n_chunks: int) -> List[Tuple[int, int]]:
+    '''
+    Cuts the log into about `n_chunks` (start, end) byte ranges, each one
+    starting right after a blank line so that no group is split in two.
+    '''
+    bounds = [0]
+    for ix in range(1, n_chunks):
+        pos = buf.find(b'\n\n', max(len(buf) * ix // n_chunks, bounds[-1]))
+        if pos == -1:
+            break
+        bounds.append(pos + 2)
+    bounds.append(len(buf))
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _chunk_top(path: str, start: int, end: int, k: int) -> List[int]:
+    import mmap
+
+    with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        def lines():
+            buf.seek(start)
+            while buf.tell() < end:
+                yield buf.readline().rstrip(b'\r\n')
+
+        return top_groups(lines(), k)
+
+
+def grouped_max_mmap(path: str, k: int = 3, workers: Optional[int] = None):
+    '''
+    Same answers as `grouped_max`, for logs too big for one core. The file is
+    memory-mapped and cut at blank lines, each worker process sums the groups
+    of its range and keeps its own top k, and those get merged.
+    '''
+    import mmap
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+
+    if os.path.getsize(path) == 0:
+        # nothing to map.
+        chunks = []
+    else:
+        with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            chunks = split_groups(buf, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tops = pool.map(_chunk_top, *zip(*((path, start, end, k) for start, end in chunks)))
+        top = heapq.nlargest(k, chain.from_iterable(tops)) or [0]
 
     # Top elf
-    yield max(groups)
+    yield max(top)
 
-    # Top 3 elves
-    groups.sort(reverse=True)
-    yield sum(groups[:3])
+    # Top k elves
+    yield sum(top)
 
 
 if __name__ == '__main__':
     test_case = grouped_max(TEST_DATA)
     assert next(test_case) == 24000
     assert next(test_case) == 45000
+    assert list(grouped_max(TEST_DATA, k=1)) == [24000, 24000]
+    assert list(grouped_max(TEST_DATA, k=10)) == [24000, 55000]
+    try:
+        next(grouped_max(TEST_DATA, k=0))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('k=0 should be rejected')
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
+        answers = grouped_max(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
 
-    answers = grouped_max(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+    # The parallel version has to agree with the plain one.
+    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
+        expected = list(grouped_max(fp))
+    assert list(grouped_max_mmap(os.path.join(__here__, 'input.txt'), workers=4)) == expected
@@ -1,4 +1,9 @@
 import os
+import re
+
+from typing import AnyStr, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from aoc.streams import InputT, iter_blocks
 
 __here__ = os.path.dirname(__file__)
 
@@ -8,85 +13,207 @@ B X
 C Z
 '''
 
-SCORES = {
-    'rock': 1,
-    'paper': 2,
-    'scissors': 3,
-}
-MOVES = {
-    'A': 'rock',
-    'X': 'rock',
-    'B': 'paper',
-    'Y': 'paper',
-    'C': 'scissors',
-    'Z': 'scissors',
-}
-
-OUTCOMES = {
-    'X': 'lose',
-    'Y': 'draw',
-    'Z': 'win',
+# The classic game: a shape defeats the ones it maps to.
+SHAPES = ('rock', 'paper', 'scissors')
+BEATS = {
+    'rock': ['scissors'],
+    'paper': ['rock'],
+    'scissors': ['paper'],
 }
-WIN_LOSE_MOVES = {
-    'rock': ['paper', 'scissors'],
-    'paper': ['scissors', 'rock'],
-    'scissors': ['rock', 'paper'],
-}
-
-
-def score_1(line):
-    r_i, r_j = line.split()
-    m_a, m_b = MOVES[r_i], MOVES[r_j]
-    score = SCORES[m_b]
-
-    did_win = any([
-        m_a == 'scissors' and m_b == 'rock',    # rock defeats scissors
-        m_a == 'paper' and m_b == 'scissors',   # scissors defeats paper
-        m_a == 'rock' and m_b == 'paper',       # paper defeats rock
-    ])
 
-    if did_win:
-        score += 6
-    elif m_a == m_b:
-        score += 3  # was a draw
 
-    return score
-
-def score_2(line):
-    i, j = line.split()
-    move, outcome = MOVES[i], OUTCOMES[j]
-
-    score = 0
-
-    if outcome == 'win':
-        my_move = WIN_LOSE_MOVES[move][0]
-        score = 6 + SCORES[my_move]
-    if outcome == 'lose':
-        my_move = WIN_LOSE_MOVES[move][1]
-        score = SCORES[my_move]
-    if outcome == 'draw':
-        my_move = move
-        score = 3 + SCORES[my_move]
-
-    return score
-
-
-def total_score(data):
-    scores_1 = [score_1(line) for line in data.splitlines()]
-    yield sum(scores_1)
-
-    scores_2 = [score_2(line) for line in data.splitlines()]
-    yield sum(scores_2)
+class ScoringTable(NamedTuple):
+    '''
+    What every possible round is worth: `scores[i * len(response) + j]` is
+    the score of opponent code `opponent[i]` against response `response[j]`.
+    '''
+    opponent: str
+    response: str
+    scores: Tuple[int, ...]
+
+    @property
+    def rounds(self) -> List[str]:
+        return [f'{i} {j}' for i in self.opponent for j in self.response]
+
+
+def check_codes(codes: str, n: int):
+    # Rounds are found by searching for "<opponent> <response>", which only
+    # works with single, distinct, non blank characters.
+    if len(codes) != n or len(set(codes)) != n or any(c.isspace() for c in codes):
+        raise ValueError(f'expected {n} distinct non blank single character codes, got {codes!r}')
+
+
+def compile_payoff(opponent: str, response: str, payoff: Sequence[Sequence[int]]) -> ScoringTable:
+    '''A table from a payoff matrix, with a row per opponent code and a column per response code.'''
+    check_codes(opponent, len(payoff))
+    for row in payoff:
+        check_codes(response, len(row))
+
+    return ScoringTable(opponent, response, tuple(score for row in payoff for score in row))
+
+
+def compile_game(
+    shapes: Sequence[str],
+    beats: Mapping[str, Iterable[str]],
+    opponent: str,
+    response: str,
+    strategy: str = 'move',
+    shape_scores: Optional[Sequence[int]] = None,
+    outcome_scores: Sequence[int] = (0, 3, 6),
+) -> ScoringTable:
+    '''
+    A table for a rock-paper-scissors like game. Opponent codes stand for
+    `shapes` in order, and so do response codes with the "move" strategy.
+    With the "outcome" strategy the 3 response codes mean lose, draw and win
+    instead, and the first shape (in `shapes` order) getting that outcome is
+    played. A shape scores its position in `shapes` plus one unless
+    `shape_scores` is given, and `outcome_scores` are for a loss, draw, win.
+    '''
+    shape_scores = shape_scores or range(1, len(shapes) + 1)
+
+    def outcome(mine, theirs):
+        if theirs in beats[mine]:
+            return 2
+        if mine in beats[theirs]:
+            return 0
+        return 1
+
+    def score(mine, theirs):
+        return shape_scores[shapes.index(mine)] + outcome_scores[outcome(mine, theirs)]
+
+    if strategy == 'move':
+        payoff = [[score(mine, theirs) for mine in shapes] for theirs in shapes]
+    elif strategy == 'outcome':
+        payoff = [
+            [score(next(s for s in shapes if outcome(s, theirs) == wanted), theirs) for wanted in range(3)]
+            for theirs in shapes
+        ]
+    else:
+        raise ValueError(f'unknown strategy {strategy!r}, expected "move" or "outcome"')
+
+    return compile_payoff(opponent, response, payoff)
+
+
+TABLE_1 = compile_game(SHAPES, BEATS, 'ABC', 'XYZ', strategy='move')
+TABLE_2 = compile_game(SHAPES, BEATS, 'ABC', 'XYZ', strategy='outcome')
+
+
+def with_line_ends(lines: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    for line in lines:
+        newline = b'\n' if isinstance(line, bytes) else '\n'
+        yield line if line.endswith(newline) else line + newline
+
+
+# lines of a round each, the opponent and the response either side of a space.
+ROUND_LINES = re.compile(r'(?:. .\r?\n)*')
+ROUND_LINES_BYTES = re.compile(rb'(?:. .\r?\n)*')
+
+
+def count_rounds(data: InputT, rounds: Sequence[str], size: int = 1 << 16) -> List[int]:
+    '''
+    How many times each of `rounds` shows up in the guide. `data` is read in
+    blocks (`str` or `bytes`) and every block is searched with `count`, so
+    there is no per-line work at all. Lines given one by one (not as a
+    string or a file) are blocks of their own.
+
+    Raises ValueError when some line is not one of `rounds`, instead of
+    leaving it out of the counts.
+    '''
+    counts = [0] * len(rounds)
+    patterns = tail = shape = None
+    n_lines = 0
+
+    if not isinstance(data, str) and not hasattr(data, 'read'):
+        data = with_line_ends(data)
+
+    for block in iter_blocks(data, size):
+        if not block:
+            continue
+        if patterns is None:
+            patterns = [r.encode() for r in rounds] if isinstance(block, bytes) else rounds
+            tail = block[:0]
+            newline = '\n' if isinstance(block, str) else b'\n'
+            shape = ROUND_LINES if isinstance(block, str) else ROUND_LINES_BYTES
+
+        # Only whole lines are looked at, the start of the next one waits for
+        # the next block.
+        block = tail + block
+        cut = block.rfind(newline) + 1
+        block, tail = block[:cut], block[cut:]
+        # there is nothing else than 3 characters centered on a space on every
+        # line, so a round can only be found where it is the whole line.
+        if not shape.fullmatch(block) or len(tail) > 4:
+            raise ValueError('the guide has lines that are not rounds')
+        for ix, pattern in enumerate(patterns):
+            counts[ix] += block.count(pattern)
+        n_lines += block.count(newline)
+
+    if tail:
+        # the last line has no line ending.
+        if not shape.fullmatch(tail + newline):
+            raise ValueError('the guide has lines that are not rounds')
+        for ix, pattern in enumerate(patterns):
+            counts[ix] += tail.count(pattern)
+        n_lines += 1
+    if sum(counts) != n_lines:
+        raise ValueError('the guide has lines that are not rounds')
+
+    return counts
+
+
+def score_guide(data: InputT, *tables: ScoringTable) -> List[int]:
+    '''
+    The total score of the guide under each of `tables`. The rounds of all
+    of them are counted in one scan, then scored with a table lookup each.
+    '''
+    rounds = sorted({r for table in tables for r in table.rounds})
+    counts = dict(zip(rounds, count_rounds(data, rounds)))
+
+    return [
+        sum(counts[r] * score for r, score in zip(table.rounds, table.scores))
+        for table in tables
+    ]
+
+
+def total_score(data: InputT):
+    # Both parts come from the same counts, so the input is read only once.
+    yield from score_guide(data, TABLE_1, TABLE_2)
 
 
 if __name__ == '__main__':
+    import io
+
     test_case = total_score(TEST_DATA)
     assert next(test_case) == 15
     assert next(test_case) == 12
+    # split rounds across blocks and lines without line endings
+    assert list(total_score(TEST_DATA.splitlines())) == [15, 12]
+    assert count_rounds(io.StringIO(TEST_DATA), TABLE_1.rounds, size=2) == [0, 1, 0, 1, 0, 0, 0, 0, 1]
+    assert list(total_score(io.BytesIO(TEST_DATA.encode()))) == [15, 12]
+    for bad_guide in ('A Y\nD X\n', 'A Y\nfoo\n', 'B  Z\n', 'A YC X\n', 'A Y\n\n', 'A YC X\n\n', 'A YC X\n\nB Z\n'):
+        try:
+            list(total_score(bad_guide))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'{bad_guide!r} should not score')
+
+    # Rock paper scissors lizard Spock, as a sanity check of the rules API
+    rpsls = compile_game(
+        ('rock', 'paper', 'scissors', 'lizard', 'spock'),
+        {
+            'rock': ['scissors', 'lizard'],
+            'paper': ['rock', 'spock'],
+            'scissors': ['paper', 'lizard'],
+            'lizard': ['paper', 'spock'],
+            'spock': ['rock', 'scissors'],
+        },
+        'ABCDE', 'VWXYZ',
+    )
+    # spock vaporizes rock (5 + 6), lizard poisons spock (4 + 6), lizard draws (4 + 3)
+    assert score_guide('A Z\nE Y\nD Y\n', rpsls) == [11 + 10 + 7]
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
-
-    answers = total_score(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+        answers = total_score(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
@@ -1,7 +1,10 @@
 import os
 
-from string import ascii_lowercase, ascii_uppercase
+from functools import reduce
+from operator import and_
+from string import ascii_letters
 
+from aoc.streams import InputT, iter_lines
 
 __here__ = os.path.dirname(__file__)
 
@@ -14,51 +17,80 @@ ttgJtRGJQctTZtZT
 CrZsJsPPZsGzwwsLwLmpwMDw
 '''
 
-PRIORITIES = {
-    **{c: i + 1 for i, c in enumerate(ascii_lowercase)},
-    **{c: i + 27 for i, c in enumerate(ascii_uppercase)},
-}
+# A bunch of items becomes a mask with a byte per item type, in priority
+# order (a-z then A-Z), left at zero for the missing ones. Common items are
+# then an `&` away, and as there is only one of those, its priority is the
+# position of the highest non zero byte of the result.
+ITEMS = ascii_letters.encode()
+ZEROS = bytes(len(ITEMS))
 
 
-def line_priority(line: str) -> int:
-    middle = len(line) // 2
-    lhs, rhs = line[:middle], line[middle:]
+def item_mask(items: bytes) -> int:
+    # Translation tables do the per item work: first to find the missing items,
+    # then to blank them out of the alphabet.
+    missing = ITEMS.translate(None, items)
+    present = ITEMS.translate(bytes.maketrans(missing, ZEROS[:len(missing)]))
+    return int.from_bytes(present, 'little')
+
+
+def mask_priority(mask: int) -> int:
+    return (mask.bit_length() + 7) // 8
 
-    common_item = list(set(lhs) & set(rhs))[0]
-    return PRIORITIES[common_item]
+
+def line_masks(line: str) -> tuple[int, int]:
+    '''Masks of both halves of the rucksack.'''
+    items = line.encode()
+    middle = len(items) // 2
+    return item_mask(items[:middle]), item_mask(items[middle:])
+
+
+def line_priority(line: str) -> int:
+    lhs, rhs = line_masks(line)
+    return mask_priority(lhs & rhs)
 
 
 def group_priority(group: list[str]) -> int:
-    g_a, g_b, g_c = group
+    common_item = reduce(and_, (item_mask(line.encode()) for line in group))
+    assert sum(map(bool, common_item.to_bytes(len(ITEMS), 'little'))) == 1
+    return mask_priority(common_item)
 
-    common_item = set(g_a) & set(g_b) & set(g_c)
-    assert len(common_item) == 1
-    badge = list(common_item)[0]
-    return PRIORITIES[badge]
 
+def iter_groups(data: InputT):
+    # groups of three consecutive lines, a trailing incomplete group is dropped.
+    lines = iter_lines(data)
+    yield from map(list, zip(lines, lines, lines))
 
-def iter_groups(data: str):
-    lines = data.splitlines()
-    n_strides = len(lines) // 3
-    yield from [lines[i * 3:(i + 1) * 3] for i in range(n_strides)]
 
+def priority_sum(data: InputT):
+    total_priority = 0
+    group_priority_sum = 0
+    group = -1
+    n_members = 0
 
-def priority_sum(data: str):
-    total_priorities = [line_priority(line) for line in data.splitlines()]
-    yield sum(total_priorities)
+    # One pass for both parts, the masks of a line are reused for its group.
+    for line in iter_lines(data):
+        lhs, rhs = line_masks(line)
+        total_priority += mask_priority(lhs & rhs)
 
-    group_priorities = [group_priority(g) for g in iter_groups(data)]
-    yield sum(group_priorities)
+        group &= lhs | rhs
+        n_members += 1
+        if n_members == 3:
+            group_priority_sum += mask_priority(group)
+            group = -1
+            n_members = 0
+
+    yield total_priority
+    yield group_priority_sum
 
 
 if __name__ == '__main__':
     test_case = priority_sum(TEST_DATA)
     assert next(test_case) == 157
     assert next(test_case) == 70
+    assert sum(map(line_priority, TEST_DATA.splitlines())) == 157
+    assert sum(map(group_priority, iter_groups(TEST_DATA))) == 70
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
-
-    answers = priority_sum(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+        answers = priority_sum(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
@@ -1,5 +1,11 @@
 import os
 
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from aoc.streams import InputT, iter_blocks, iter_lines
 
 __here__ = os.path.dirname(__file__)
 
@@ -21,11 +27,11 @@ def bounds(line):
 
 
 def fully_overlaps(line):
-    a_x, a_y, b_x, b_y = bounds(line)
-    return any([
-        a_x <= b_x and a_y >= b_y,
-        b_x <= a_x and b_y >= a_y,
-    ])
+    return contains(*bounds(line))
+
+
+def contains(a_x, a_y, b_x, b_y):
+    return (a_x <= b_x and a_y >= b_y) or (b_x <= a_x and b_y >= a_y)
 
 
 def any_overlap(line):
@@ -38,29 +44,269 @@ def any_overlap(line):
       b_x |--*****|         b_y     } a_x >= b_x & a_x <= b_y
       b_x |--***********--| b_y     }./
     '''
-    a_x, a_y, b_x, b_y = bounds(line)
-    return any([
-        a_x <= b_x and a_y >= b_x,
-        a_x >= b_x and a_x <= b_y,
-    ])
+    return overlaps(*bounds(line))
+
+
+def overlaps(a_x, a_y, b_x, b_y):
+    return (a_x <= b_x and a_y >= b_x) or (a_x >= b_x and a_x <= b_y)
+
+
+def count_pairs(data: InputT) -> Tuple[int, int]:
+    '''Counts full and partial overlaps line by line, parsing each line once.'''
+    full_overlaps = 0
+    partial_overlaps = 0
+
+    for line in iter_lines(data):
+        pair = bounds(line)
+        full_overlaps += contains(*pair)
+        partial_overlaps += overlaps(*pair)
 
+    return full_overlaps, partial_overlaps
+
+
+def iter_text_blocks(data: InputT, size: int) -> Iterator[str]:
+    # Blocks of whole lines' worth of text, lines given one by one are joined.
+    if isinstance(data, str) or hasattr(data, 'read'):
+        yield from iter_blocks(data, size)
+        return
+
+    lines = iter(data)
+    while batch := list(islice(lines, size // 16)):
+        yield '\n'.join(batch) + '\n'
+
+
+def count_pairs_numpy(data: InputT, np, size: int = 1 << 22) -> Tuple[int, int]:
+    '''
+    Same as `count_pairs`, with NumPy. The input is parsed a block at a time
+    into an (N, 4) array of bounds, and the overlaps are boolean reductions
+    over its columns.
+    '''
+    separators = str.maketrans(',-', '  ')
+    full_overlaps = 0
+    partial_overlaps = 0
 
-def common_pairs(data: str):
-    pairs = [True for line in data.splitlines() if fully_overlaps(line)]
-    yield len(pairs)
+    def count(text):
+        nonlocal full_overlaps, partial_overlaps
+        pairs = np.fromstring(text.translate(separators), dtype=np.int64, sep=' ').reshape(-1, 4)
+        a_x, a_y, b_x, b_y = pairs.T
+        full_overlaps += int(np.count_nonzero(((a_x <= b_x) & (a_y >= b_y)) | ((b_x <= a_x) & (b_y >= a_y))))
+        partial_overlaps += int(np.count_nonzero((a_x <= b_y) & (b_x <= a_y)))
 
-    pairs = [True for line in data.splitlines() if any_overlap(line)]
-    yield len(pairs)
+    tail = ''
+    for block in iter_text_blocks(data, size):
+        # the last line may go on in the next block.
+        block = tail + block
+        cut = block.rfind('\n') + 1
+        tail = block[cut:]
+        if cut:
+            count(block[:cut])
+    if tail.strip():
+        count(tail)
+
+    return full_overlaps, partial_overlaps
+
+
+class Assignment(NamedTuple):
+    pair: int   # line of the input, from 0
+    elf: int    # first (0) or second (1) of the pair
+    start: int
+    end: int
+
+
+def iter_assignments(data: InputT) -> Iterator[Assignment]:
+    for pair, line in enumerate(iter_lines(data)):
+        a_x, a_y, b_x, b_y = bounds(line)
+        yield Assignment(pair, 0, a_x, a_y)
+        yield Assignment(pair, 1, b_x, b_y)
+
+
+class IntervalNode:
+    '''
+    A node of a centered interval tree: the assignments containing `center`,
+    sorted by start and by end, with the ones entirely to the left and to
+    the right of it in the subtrees.
+    '''
+    def __init__(self, assignments: List[Assignment]):
+        endpoints = sorted(x for a in assignments for x in (a.start, a.end))
+        self.center = endpoints[len(endpoints) // 2]
+
+        here, left, right = [], [], []
+        for a in assignments:
+            if a.end < self.center:
+                left.append(a)
+            elif a.start > self.center:
+                right.append(a)
+            else:
+                here.append(a)
+
+        self.by_start = sorted(here, key=attrgetter('start'))
+        self.by_end = sorted(here, key=attrgetter('end'), reverse=True)
+        # center is one of the endpoints, so `here` is never empty and both
+        # sides have at most half of the assignments: the tree stays balanced.
+        self.left = IntervalNode(left) if left else None
+        self.right = IntervalNode(right) if right else None
+
+
+class IntervalIndex:
+    '''
+    All the section assignments of an input, to find the ones holding a
+    section (stabbing) or overlapping a range of sections in O(log n + k),
+    k being the number of assignments found.
+    '''
+    def __init__(self, assignments: Iterable[Assignment]):
+        assignments = list(assignments)
+        self.root = IntervalNode(assignments) if assignments else None
+        # assignments by start, for the ones starting within a range.
+        self.by_start = sorted(assignments, key=attrgetter('start'))
+        self.starts = [a.start for a in self.by_start]
+
+    @classmethod
+    def from_input(cls, data: InputT) -> 'IntervalIndex':
+        return cls(iter_assignments(data))
+
+    def __len__(self) -> int:
+        return len(self.by_start)
+
+    def stab(self, section: int) -> List[Assignment]:
+        '''The assignments containing `section`.'''
+        found = []
+        node = self.root
+
+        while node is not None:
+            if section < node.center:
+                # all of them end past `section`, only the start matters.
+                for a in node.by_start:
+                    if a.start > section:
+                        break
+                    found.append(a)
+                node = node.left
+            elif section > node.center:
+                for a in node.by_end:
+                    if a.end < section:
+                        break
+                    found.append(a)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                break
+
+        return found
+
+    def overlapping(self, start: int, end: int) -> List[Assignment]:
+        '''The assignments sharing at least a section with `start`-`end`.'''
+        # Either an assignment holds `start`, or it starts later within the range.
+        lo = bisect_right(self.starts, start)
+        hi = bisect_right(self.starts, end)
+        return self.stab(start) + self.by_start[lo:hi]
+
+    def stab_many(self, sections: Iterable[int]) -> List[List[Assignment]]:
+        return [self.stab(section) for section in sections]
+
+    def overlapping_many(self, ranges: Iterable[Tuple[int, int]]) -> List[List[Assignment]]:
+        return [self.overlapping(start, end) for start, end in ranges]
+
+
+class OverlapStats(NamedTuple):
+    overlapping_pairs: int  # pairs of assignments sharing a section
+    contained_pairs: int    # pairs where one assignment holds the other
+    peak_depth: int         # most assignments sharing a single section
+
+
+def overlap_stats(data: InputT) -> OverlapStats:
+    '''
+    Compares every assignment of the input with every other, not only within
+    lines, in O(n log n) instead of going through all the pairs.
+    '''
+    assignments = list(iter_assignments(data))
+    n = len(assignments)
+
+    # Two assignments overlap unless one ends before the other starts, and
+    # that disjoint pair is then counted once, at the one starting later.
+    ends = sorted(a.end for a in assignments)
+    disjoint = sum(bisect_left(ends, a.start) for a in assignments)
+    overlapping_pairs = n * (n - 1) // 2 - disjoint
+
+    # By start, and the longest first at equal starts, any assignment seen
+    # before starts no later: it holds the current one if it ends no sooner.
+    # Those are counted with a Fenwick tree over the ranks of the ends.
+    ranks = {end: rank for rank, end in enumerate(sorted(set(ends)), start=1)}
+    tree = [0] * (len(ranks) + 1)
+    contained_pairs = 0
+
+    for seen, a in enumerate(sorted(assignments, key=lambda a: (a.start, -a.end))):
+        # how many seen so far end strictly before this one does.
+        ix = ranks[a.end] - 1
+        ending_before = 0
+        while ix > 0:
+            ending_before += tree[ix]
+            ix -= ix & -ix
+        contained_pairs += seen - ending_before
+
+        ix = ranks[a.end]
+        while ix < len(tree):
+            tree[ix] += 1
+            ix += ix & -ix
+
+    # Sweep over the sections, leaving assignments before entering new ones
+    # at the same section: sections are inclusive, an assignment ending at 4
+    # is gone at 5.
+    events = sorted([(a.start, 1) for a in assignments] + [(a.end + 1, -1) for a in assignments])
+    depth = peak_depth = 0
+    for _, delta in events:
+        depth += delta
+        peak_depth = max(peak_depth, depth)
+
+    return OverlapStats(overlapping_pairs, contained_pairs, peak_depth)
+
+
+def common_pairs(data: InputT):
+    # When NumPy is around the pairs are counted in bulk with it.
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is None:
+        counts = count_pairs(data)
+    else:
+        counts = count_pairs_numpy(data, np)
+
+    yield from counts
 
 
 if __name__ == '__main__':
     test_case = common_pairs(TEST_DATA)
     assert next(test_case) == 2
     assert next(test_case) == 4
+    assert count_pairs(TEST_DATA) == (2, 4)
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        assert count_pairs_numpy(TEST_DATA, np) == (2, 4)
+        assert count_pairs_numpy(TEST_DATA.splitlines(), np) == (2, 4)
+        assert count_pairs_numpy(TEST_DATA.rstrip(), np, size=5) == (2, 4)
 
-    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
+    index = IntervalIndex.from_input(TEST_DATA)
+    assignments = list(iter_assignments(TEST_DATA))
+    for section in range(0, 11):
+        expected = {a for a in assignments if a.start <= section <= a.end}
+        assert set(index.stab(section)) == expected
+        assert len(index.stab(section)) == len(expected)
+        for end in range(section, 11):
+            expected = {a for a in assignments if a.start <= end and section <= a.end}
+            assert sorted(index.overlapping(section, end)) == sorted(expected)
+    assert index.stab_many([1, 6]) == [[], index.stab(6)]
+
+    pairs = [(a, b) for i, a in enumerate(assignments) for b in assignments[i + 1:]]
+    assert overlap_stats(TEST_DATA) == OverlapStats(
+        overlapping_pairs=sum(overlaps(a.start, a.end, b.start, b.end) for a, b in pairs),
+        contained_pairs=sum(contains(a.start, a.end, b.start, b.end) for a, b in pairs),
+        peak_depth=max(len(index.stab(section)) for section in range(10)),
+    )
 
-    answers = common_pairs(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
+        answers = common_pairs(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
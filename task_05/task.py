@@ -2,7 +2,7 @@ import os
 import re
 
 from collections import namedtuple
-from typing import List, Dict, Tuple
+from typing import List, Dict, Sequence, Tuple
 
 
 __here__ = os.path.dirname(__file__)
@@ -30,13 +30,16 @@ def parse_stack(stacks: List[str]) -> StackT:
     for line in stacks:
         # take every element at strides, starting from index 1.
         items = [line[i] for i in range(1, n_line, 4)]
-        # fill the relevant stacks; top of stack is the last element.
+        # fill the relevant stacks, top down for now.
         for i, item in enumerate(items):
             if item != ' ':
-                stack[i + 1].insert(0, item)
+                stack[i + 1].append(item)
+    # top of stack is the last element.
+    for crates in stack.values():
+        crates.reverse()
     return stack
 
-def parse_input(data: str) -> Tuple[StackT, List[RearrangementRule]]:
+def parse_input(data: str) -> Tuple[StackT, Tuple[RearrangementRule, ...]]:
     stacks = []
     rearrangements = []
 
@@ -53,41 +56,130 @@ def parse_input(data: str) -> Tuple[StackT, List[RearrangementRule]]:
         else:
             rearrangements.append(parse_rearrangement(line))
 
-    return parse_stack(stacks), rearrangements
+    return parse_stack(stacks), tuple(rearrangements)
 
-def apply_rearrangement(stack: StackT, rules: List[RearrangementRule], one_by_one=True) -> StackT:
+def apply_rearrangement(stack: StackT, rules: Sequence[RearrangementRule], one_by_one=True) -> StackT:
     # Note: modifies stack in place!
     for rule in rules:
         # move [count] from [src] to [dest]
+        if rule.count == 0 or rule.src == rule.dest:
+            # nothing moves, either way.
+            continue
+        # Only the moved crates are copied, the rest of both stacks stays put:
+        # the source is truncated and the destination extended in place.
+        src = stack[rule.src]
+        if rule.count > len(src):
+            # slicing would quietly move fewer crates.
+            raise IndexError(f'cannot move {rule.count} crates off stack {rule.src} of {len(src)}')
+        crates = src[-rule.count:]
+        del src[-rule.count:]
         if one_by_one:
-            for _ in range(rule.count):
-                stack[rule.dest].append(stack[rule.src].pop())
-        else:
-            src = stack[rule.src]
-            stack[rule.src] = src[:-rule.count]
-            stack[rule.dest] += src[-rule.count:]
+            # crates come off one at a time, so they land upside down.
+            crates.reverse()
+        stack[rule.dest] += crates
     return stack
 
+def clone_stack(stack: StackT) -> StackT:
+    # rearrangements work in place, each part gets its own copy of the crates.
+    return {ix: crates[:] for ix, crates in stack.items()}
+
 def top_of_the_stack(stack: StackT) -> str:
     return ''.join([stack[r + 1][-1] for r in range(len(stack))])
 
-def stack_state(data: str):
-    stack_1 = apply_rearrangement(*parse_input(data))
+def trace_tops(stack: StackT, rules: Sequence[RearrangementRule], one_by_one=True) -> str:
+    '''
+    Same as `top_of_the_stack` after `apply_rearrangement`, without moving
+    any crate: only the stack heights are followed through the rules, then
+    the spots ending on top are followed back to where their crates start.
+    '''
+    heights = {ix: len(crates) for ix, crates in stack.items()}
+    for rule in rules:
+        if rule.count > heights[rule.src] and rule.src != rule.dest:
+            raise IndexError(f'cannot move {rule.count} crates off stack {rule.src} of {heights[rule.src]}')
+        heights[rule.src] -= rule.count
+        heights[rule.dest] += rule.count
+
+    # (stack, index from the bottom) of every top, in stack order, and the
+    # same spots by stack as most moves do not touch any of them.
+    spots = []
+    for ix in sorted(heights):
+        if heights[ix] == 0:
+            raise IndexError(f'stack {ix} ends up empty')
+        spots.append([ix, heights[ix] - 1])
+    spots_on = {ix: [spot] for ix, spot in zip(sorted(heights), spots)}
+
+    for rule in reversed(rules):
+        if rule.count == 0 or rule.src == rule.dest:
+            continue
+        # undo the move, heights are now as they were before it.
+        heights[rule.src] += rule.count
+        heights[rule.dest] -= rule.count
 
+        on_dest = spots_on[rule.dest]
+        if not on_dest:
+            continue
+        staying = []
+        for spot in on_dest:
+            offset = spot[1] - heights[rule.dest]
+            if offset < 0:
+                # not one of the moved crates.
+                staying.append(spot)
+                continue
+            spot[0] = rule.src
+            if one_by_one:
+                # the first crate off the source ends lowest on the destination.
+                spot[1] = heights[rule.src] - 1 - offset
+            else:
+                spot[1] = heights[rule.src] - rule.count + offset
+            spots_on[rule.src].append(spot)
+        spots_on[rule.dest] = staying
+
+    return ''.join(stack[ix][index] for ix, index in spots)
+
+
+def solve(model: Tuple[StackT, Tuple[RearrangementRule, ...]], reverse=False):
+    '''
+    Both answers from the output of `parse_input`, which is left untouched.
+    With `reverse`, the tops are traced back through the rules instead of
+    running the rearrangements, see `trace_tops`.
+    '''
+    stack, rules = model
+
+    if reverse:
+        yield trace_tops(stack, rules)
+        yield trace_tops(stack, rules, one_by_one=False)
+        return
+
+    stack_1 = apply_rearrangement(clone_stack(stack), rules)
     yield top_of_the_stack(stack_1)
 
-    stack_2 = apply_rearrangement(*parse_input(data), one_by_one=False)
+    stack_2 = apply_rearrangement(clone_stack(stack), rules, one_by_one=False)
     yield top_of_the_stack(stack_2)
 
 
+def stack_state(data: str, reverse=False):
+    yield from solve(parse_input(data), reverse=reverse)
+
+
 if __name__ == '__main__':
     test_case = stack_state(TEST_DATA)
     assert next(test_case) == 'CMZ'
     assert next(test_case) == 'MCD'
+    assert list(stack_state(TEST_DATA, reverse=True)) == ['CMZ', 'MCD']
+    for reverse in (False, True):
+        try:
+            list(stack_state(TEST_DATA.replace('move 3 from 1 to 3', 'move 4 from 1 to 3'), reverse=reverse))
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('moving more crates than there are should fail')
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
         data = fp.read()
 
+    # tracing the tops back has to agree with the full simulation.
+    assert list(stack_state(data, reverse=True)) == list(stack_state(data))
+
     answers = stack_state(data)
     print(f'answer_1={next(answers)}')
     print(f'answer_2={next(answers)}')
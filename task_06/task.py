@@ -1,6 +1,12 @@
 import os
 
-from typing import Iterator, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from aoc.streams import InputT, iter_blocks
+
+if TYPE_CHECKING:
+    # asyncio is heavy to import, and only `detect_markers` is about it.
+    import asyncio
 
 __here__ = os.path.dirname(__file__)
 
@@ -12,30 +18,119 @@ TEST_DATA = [
     ('zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw', 11, 26),
 ]
 
-def iter_chunks(data: str, n_chunk: int = 4) -> Iterator[Tuple[int, str]]:
-    n_items = len(data)
-    for i in range(n_items - (n_chunk - 1)):
-        yield i, data[i:i + n_chunk]
+class MarkerDetector:
+    '''
+    Finds the first marker of each of `windows` lengths in a stream fed in
+    chunks, as they arrive. Every length has a window sliding over the
+    stream, with the count of every character in it and how many of those
+    are repeats: a marker is a window without any. Only the last
+    `max(windows)` bytes are kept between chunks.
+    '''
+    def __init__(self, windows: Sequence[int] = (4, 14)):
+        self.windows = tuple(windows)
+        self.markers: Dict[int, int] = {}
+        self.pos = 0
+        self._counts = [[0] * 256 for _ in self.windows]
+        self._repeats = [0] * len(self.windows)
+        self._searching = list(range(len(self.windows)))
+        # characters still in the longest window, from the previous chunks.
+        self._history = b''
+
+    @property
+    def done(self) -> bool:
+        return not self._searching
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, int]]:
+        '''The (window, position) of the markers ending in `chunk`.'''
+        found = []
+        windows, counts, repeats = self.windows, self._counts, self._repeats
+        searching = self._searching
+
+        buf = self._history + chunk
+        offset = self.pos - len(self._history)
+
+        for i in range(len(self._history), len(buf)):
+            if not searching:
+                break
+            char = buf[i]
+            for ix in searching:
+                window = windows[ix]
+                count = counts[ix]
+                count[char] += 1
+                if count[char] == 2:
+                    repeats[ix] += 1
+                # the character leaving the window, once it is full.
+                if offset + i >= window:
+                    gone = buf[i - window]
+                    count[gone] -= 1
+                    if count[gone] == 1:
+                        repeats[ix] -= 1
+                if repeats[ix] == 0 and offset + i + 1 >= window:
+                    self.markers[window] = offset + i + 1
+                    found.append((window, offset + i + 1))
+            if found and found[-1][1] == offset + i + 1:
+                searching = [ix for ix in searching if windows[ix] not in self.markers]
+
+        self._searching = searching
+        self.pos += len(chunk)
+        self._history = buf[-max(windows):]
+        return found
+
+
+async def detect_markers(reader: 'asyncio.StreamReader', windows: Sequence[int] = (4, 14), chunk_size: int = 1 << 16):
+    '''
+    Yields the (window, position) of the markers read from `reader` as soon
+    as the chunk holding them comes in, and stops once all are found.
+    '''
+    detector = MarkerDetector(windows)
+    while not detector.done:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        for marker in detector.feed(chunk):
+            yield marker
 
-def first_marker_pos(packet: str, chunklen: int) -> int:
-    for pos, chunk in iter_chunks(packet, n_chunk=chunklen):
-        if len(chunk) == len(set(chunk)):
-            return pos + chunklen
 
-def packet_start(data: str):
-    yield first_marker_pos(data, chunklen=4)
-    yield first_marker_pos(data, chunklen=14)
+def first_marker_positions(data: InputT, chunklens: Sequence[int]) -> List[Optional[int]]:
+    # Scans the stream once for all the marker lengths.
+    detector = MarkerDetector(chunklens)
+
+    for block in iter_blocks(data):
+        if isinstance(block, str):
+            block = block.encode('latin-1')
+        detector.feed(block)
+        if detector.done:
+            break
+
+    return [detector.markers.get(chunklen) for chunklen in chunklens]
+
+def first_marker_pos(packet: InputT, chunklen: int) -> Optional[int]:
+    return first_marker_positions(packet, [chunklen])[0]
+
+def packet_start(data: InputT):
+    start_of_packet, start_of_message = first_marker_positions(data, [4, 14])
+    yield start_of_packet
+    yield start_of_message
 
 
 if __name__ == '__main__':
+    import asyncio
+
     for test_line, start_of_packet, start_of_message in TEST_DATA:
         test_case = packet_start(test_line)
         assert next(test_case) == start_of_packet
         assert next(test_case) == start_of_message
 
-    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
+    async def feed_reader(packet):
+        reader = asyncio.StreamReader()
+        reader.feed_data(packet.encode())
+        reader.feed_eof()
+        return [marker async for marker in detect_markers(reader, chunk_size=3)]
+
+    for test_line, start_of_packet, start_of_message in TEST_DATA:
+        assert asyncio.run(feed_reader(test_line)) == [(4, start_of_packet), (14, start_of_message)]
 
-    answers = packet_start(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
+        answers = packet_start(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
@@ -1,10 +1,13 @@
 import os
 
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import namedtuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import PurePosixPath
-from typing import List, Union
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
+from aoc.streams import InputT, iter_lines
 
 __here__ = os.path.dirname(__file__)
 
@@ -32,10 +35,19 @@ class Directory:
     name: str
     content: List[Union[File, 'Directory']]
     parent: 'Directory' = None
+    # Kept up to date by `add`: the total size of the subtree, and the
+    # entries by name.
+    _size: int = field(default=0, init=False, repr=False, compare=False)
+    _index: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # the entries it is created with count as well.
+        self._index = {item.name: item for item in self.content}
+        self._size = sum(item.size for item in self.content)
 
     @property
     def size(self) -> int:
-        return sum([item.size for item in self.content])
+        return self._size
 
     @property
     def abspath(self) -> PurePosixPath:
@@ -43,19 +55,32 @@ class Directory:
 
     @property
     def _mapping(self) -> dict:
-        return {item.name: item for item in self.content}
+        return self._index
 
     def __getitem__(self, key: str) -> Union[File, 'Directory']:
-        return self._mapping[key]
+        return self._index[key]
+
+    def add(self, item: Union[File, 'Directory']):
+        '''Adds an entry, its size counting towards every directory above.'''
+        if item.name in self._index:
+            # listed again, already accounted for.
+            return
+        self.content.append(item)
+        self._index[item.name] = item
+
+        directory = self
+        while directory is not None:
+            directory._size += item.size
+            directory = directory.parent
 
 
-def parse_term_output(data: str) -> Directory:
+def parse_term_output(data: InputT) -> Directory:
     '''Builds the filesystem representation from terminal output.'''
     path = PurePosixPath('/')
     root_dir = Directory(path=path, name='/', content=[])
     current_dir = root_dir
 
-    for line in data.splitlines():
+    for line in iter_lines(data):
         args = line.split(' ')
         if args[0] == '$':
             # it's a command.
@@ -77,48 +102,251 @@ def parse_term_output(data: str) -> Directory:
             else:
                 # it's a file
                 item = File(path=path, name=args[1], size=int(args[0]), parent=current_dir)
-            current_dir.content.append(item)
+            current_dir.add(item)
 
     return root_dir
 
 
 def directory_stats(root_dir: Directory) -> List[DirStat]:
     sizes = []
+    # depth first, without recursing: trees can be deep.
+    pending = [root_dir]
 
-    def dir_sizes(directory):
+    while pending:
+        directory = pending.pop()
         sizes.append(DirStat(directory.abspath, directory.size))
-        for item in directory.content:
-            if type(item) == Directory:
-                dir_sizes(item)
+        pending.extend(reversed([item for item in directory.content if type(item) == Directory]))
 
-    dir_sizes(root_dir)
     return sizes
 
 
-def fs_counter(data: str):
-    file_system = parse_term_output(data)
-    fs_stats = directory_stats(file_system)
+class ColumnarFS:
+    '''
+    The same filesystem as `parse_term_output` builds, for large ones: entries
+    are rows of parallel arrays instead of objects, and their names sit in one
+    byte string, each followed by a '/'.
+    Entry 0 is the root, and an entry always comes after its parent. The
+    children of a directory are added together, by the `ls` listing it, so
+    they are one run of entries, `first_child[ix]` to `first_child[ix] + n_children[ix]`.
+    '''
+    def __init__(self):
+        self.parents = array('i', [0])
+        self.sizes = array('q', [0])    # of files, and of whole subtrees after `aggregate`.
+        self.is_dir = bytearray([1])
+        self.name_offsets = array('I', [1])
+        self.name_lengths = array('H', [0])
+        self.blob = bytearray(b'//')
+        self.first_child = array('i', [-1])     # -1 until the directory is listed.
+        self.n_children = array('i', [0])
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, parent: int, name: str, size: int = 0, is_dir: bool = False) -> int:
+        ix = len(self.parents)
+        if self.first_child[parent] == -1:
+            self.first_child[parent] = ix
+        elif self.first_child[parent] + self.n_children[parent] != ix:
+            raise ValueError(f'the entries of {self.path(parent)} must be added together')
+        self.n_children[parent] += 1
+
+        encoded = name.encode()
+        self.parents.append(parent)
+        self.sizes.append(size)
+        self.is_dir.append(is_dir)
+        self.name_offsets.append(len(self.blob))
+        self.name_lengths.append(len(encoded))
+        self.blob += encoded
+        self.blob += b'/'
+        self.first_child.append(-1)
+        self.n_children.append(0)
+        return ix
+
+    def name(self, ix: int) -> str:
+        offset = self.name_offsets[ix]
+        return self.blob[offset:offset + self.name_lengths[ix]].decode()
+
+    def subdir(self, parent: int, name: str) -> int:
+        first = self.first_child[parent]
+        if first == -1:
+            raise KeyError(name)
+        last = first + self.n_children[parent] - 1
+        offsets = self.name_offsets
+        # the names of the children are one run of the blob too, every one of them
+        # between two '/', so a search for '/name/' only matches whole names.
+        needle = b'/' + name.encode() + b'/'
+        end = offsets[last] + self.name_lengths[last] + 1
+        pos = self.blob.find(needle, offsets[first] - 1, end)
+        while pos != -1:
+            ix = bisect_left(offsets, pos + 1, first, last + 1)
+            if self.is_dir[ix]:
+                return ix
+            pos = self.blob.find(needle, pos + 1, end)
+        raise KeyError(name)
+
+    @classmethod
+    def from_term_output(cls, data: InputT) -> 'ColumnarFS':
+        fs = cls()
+        current = 0
+        skip = False
+
+        for line in iter_lines(data):
+            args = line.split(' ')
+            if args[0] == '$':
+                if args[1] == 'cd':
+                    if args[2] == '/':
+                        current = 0
+                    elif args[2] == '..':
+                        current = fs.parents[current]
+                    else:
+                        current = fs.subdir(current, args[2])
+                if args[1] == 'ls':
+                    # listed again, already accounted for.
+                    skip = fs.first_child[current] != -1
+            elif not skip:
+                if args[0] == 'dir':
+                    fs.add(current, args[1], is_dir=True)
+                else:
+                    fs.add(current, args[1], size=int(args[0]))
+
+        fs.aggregate()
+        return fs
 
-    yield sum([s.size for s in fs_stats if s.size <= 100000])
+    def aggregate(self):
+        '''Turns directory sizes into subtree totals, in one sweep from the leaves up.'''
+        parents, sizes = self.parents, self.sizes
+        # children come after their parent, so going backwards every entry is
+        # complete by the time it is added to its parent.
+        for ix in range(len(parents) - 1, 0, -1):
+            sizes[parents[ix]] += sizes[ix]
+
+    @property
+    def size(self) -> int:
+        return self.sizes[0]
+
+    def path(self, ix: int) -> PurePosixPath:
+        parts = []
+        while ix != 0:
+            parts.append(self.name(ix))
+            ix = self.parents[ix]
+        return PurePosixPath('/', *reversed(parts))
+
+    def dir_sizes(self) -> Iterator[Tuple[int, int]]:
+        '''(entry, size) of every directory, no paths involved.'''
+        sizes = self.sizes
+        ix = self.is_dir.find(1)
+        while ix != -1:
+            yield ix, sizes[ix]
+            ix = self.is_dir.find(1, ix + 1)
+
+    def directory_stats(self) -> Iterator[DirStat]:
+        # like `directory_stats`, in entry order, with paths built one at a time.
+        for ix, size in self.dir_sizes():
+            yield DirStat(self.path(ix), size)
+
+
+class DirectoryIndex:
+    '''
+    Directory sizes sorted once, to answer du-like questions with a bisect:
+    the directories at most or over a size, the smallest one at least some
+    size and the largest ones, in O(log n + k) for k directories returned.
+    '''
+    def __init__(self, entries: Iterable[Tuple[Any, int]], stat: Optional[Callable[[Any, int], DirStat]] = None):
+        '''
+        `entries` are (key, size) pairs, and `stat` makes the `DirStat` of a
+        key when it is part of an answer (keys are `DirStat`s by default).
+        '''
+        entries = sorted(entries, key=lambda entry: entry[1])
+        self.keys = [key for key, _ in entries]
+        self.sizes = [size for _, size in entries]
+        self._stat = stat or (lambda key, size: key)
+        # running totals, self.totals[i] being the sum of the i smallest sizes.
+        self.totals = [0]
+        for size in self.sizes:
+            self.totals.append(self.totals[-1] + size)
+
+    @classmethod
+    def from_stats(cls, stats: Iterable[DirStat]) -> 'DirectoryIndex':
+        return cls((stat, stat.size) for stat in stats)
+
+    @classmethod
+    def from_columnar(cls, fs: ColumnarFS) -> 'DirectoryIndex':
+        # paths are only built for the directories in the answers.
+        return cls(fs.dir_sizes(), stat=lambda ix, size: DirStat(fs.path(ix), size))
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def _stats(self, start: int, stop: int) -> List[DirStat]:
+        return [self._stat(self.keys[ix], self.sizes[ix]) for ix in range(start, stop)]
+
+    def at_most(self, size: int) -> List[DirStat]:
+        return self._stats(0, bisect_right(self.sizes, size))
+
+    def over(self, size: int) -> List[DirStat]:
+        return self._stats(bisect_right(self.sizes, size), len(self.sizes))
+
+    def total_at_most(self, size: int) -> int:
+        '''The sum of the sizes of the directories of at most `size`, in O(log n).'''
+        return self.totals[bisect_right(self.sizes, size)]
+
+    def smallest_at_least(self, size: int) -> Optional[DirStat]:
+        ix = bisect_left(self.sizes, size)
+        if ix == len(self.sizes):
+            return None
+        return self._stat(self.keys[ix], self.sizes[ix])
+
+    def top_k(self, k: int) -> List[DirStat]:
+        '''The `k` largest directories, largest first.'''
+        return self._stats(max(len(self.sizes) - k, 0), len(self.sizes))[::-1]
+
+
+def fs_counter(data: InputT, columnar=False):
+    '''With `columnar`, the filesystem is a `ColumnarFS` instead of objects.'''
+    if columnar:
+        file_system = ColumnarFS.from_term_output(data)
+        index = DirectoryIndex.from_columnar(file_system)
+    else:
+        file_system = parse_term_output(data)
+        index = DirectoryIndex.from_stats(directory_stats(file_system))
+
+    yield index.total_at_most(100000)
 
     free_space = TOTAL_DISK_SIZE - file_system.size
     assert free_space >= 0
 
     deletion_size = NEEDED_DISK_SPACE - free_space
-    candidates = [s for s in fs_stats if s.size >= deletion_size]
-    dir_to_delete = min(candidates, key=lambda x: x.size)
-
-    yield dir_to_delete.size
+    yield index.smallest_at_least(deletion_size).size
 
 
 if __name__ == '__main__':
     test_case = fs_counter(TEST_DATA)
     assert next(test_case) == 95437
     assert next(test_case) == 24933642
+    assert list(fs_counter(TEST_DATA, columnar=True)) == [95437, 24933642]
+    built = Directory(PurePosixPath('/'), 'a', [File(PurePosixPath('/a'), 'b.txt', 10, None)])
+    assert built.size == 10 and built['b.txt'].size == 10
+    assert sorted(ColumnarFS.from_term_output(TEST_DATA).directory_stats()) == \
+        sorted(directory_stats(parse_term_output(TEST_DATA)))
+
+    for index in (
+        DirectoryIndex.from_stats(directory_stats(parse_term_output(TEST_DATA))),
+        DirectoryIndex.from_columnar(ColumnarFS.from_term_output(TEST_DATA)),
+    ):
+        assert [str(s.path) for s in index.at_most(100000)] == ['/a/e', '/a']
+        assert [str(s.path) for s in index.over(100000)] == ['/d', '/']
+        assert index.smallest_at_least(8381165) == DirStat(PurePosixPath('/d'), 24933642)
+        assert index.smallest_at_least(10 ** 9) is None
+        assert index.top_k(2) == [DirStat(PurePosixPath('/'), 48381165), DirStat(PurePosixPath('/d'), 24933642)]
+        assert index.top_k(10) == index.over(0)[::-1]
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
+        answers = fs_counter(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
 
-    answers = fs_counter(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+    # both models have to agree.
+    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
+        expected = list(fs_counter(fp))
+    with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
+        assert list(fs_counter(fp, columnar=True)) == expected
@@ -1,6 +1,8 @@
 import os
 
-from typing import Iterator, List
+from typing import Iterator
+
+from aoc.grid import Grid
 
 __here__ = os.path.dirname(__file__)
 
@@ -12,23 +14,25 @@ TEST_DATA = '''\
 35390
 '''
 
-TreeMapT = List[List[int]]
+TreeMapT = Grid
+
+HEIGHTS = bytes.maketrans(b'0123456789', bytes(range(10)))
 
 
 def parse_input(data: str) -> TreeMapT:
-    return [list(map(int, line)) for line in data.splitlines()]
+    # read-only, both parts look at the same map.
+    return Grid.from_lines(data.splitlines(), table=HEIGHTS)
 
 
 def iter_tree_dirs(treemap: TreeMapT) -> Iterator:
-    x_bound, y_bound = len(treemap), len(treemap[0])
-    # create a column oriented view from row oriented treemap
-    treemap_col = list(zip(*treemap))
+    x_bound, y_bound = treemap.shape
 
     for x in range(x_bound):
+        row = treemap.row(x)
         for y in range(y_bound):
-            height = treemap[x][y]
-            row = treemap[x]
-            col = treemap_col[y]
+            height = row[y]
+            # row and column views share the grid's buffer, no copies here.
+            col = treemap.col(y)
 
             all_dirs = [
                 row[:y][::-1],      # Left (inverted)
@@ -69,9 +73,14 @@ def scenic_score(treemap: TreeMapT) -> int:
     return max(scores)
 
 
+def solve(treemap: TreeMapT):
+    '''Both answers from the output of `parse_input`.'''
+    yield visible_trees(treemap)
+    yield scenic_score(treemap)
+
+
 def trees_count(data: str):
-    yield visible_trees(parse_input(data))
-    yield scenic_score(parse_input(data))
+    yield from solve(parse_input(data))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,8 @@
 import os
 
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Sequence, Tuple
+
+from aoc.streams import InputT, iter_lines
 
 __here__ = os.path.dirname(__file__)
 
@@ -111,14 +113,6 @@ def move_tail(head: Point, tail: Point) -> Point:
                 assert False
     return tail
 
-def move_rope_segment(head: Point, tail: Point, dirn: str) -> Tuple[Point, Point]:
-    delta = MOVEMENTS[dirn]
-
-    head = head + delta
-    tail = move_tail(head, tail)
-
-    return head, tail
-
 def move_rope(knots: List[Point], dirn: str) -> List[Point]:
     # head is the first knot, tail is the last one.
     delta = MOVEMENTS[dirn]
@@ -133,8 +127,8 @@ def move_rope(knots: List[Point], dirn: str) -> List[Point]:
 
     return new_knots
 
-def parse_input(data: str) -> Iterator[Tuple[str, int]]:
-    for line in data.splitlines():
+def parse_input(data: InputT) -> Iterator[Tuple[str, int]]:
+    for line in iter_lines(data):
         dirn, amount = line.split(' ')
         yield dirn, int(amount)
 
@@ -153,36 +147,33 @@ def plot_knots(tail_pos: List[Point]):
     print('\n'.join([''.join(row) for row in surface]))
     print('\033[0m')
 
-def simulate_small_rope(data):
-    head = Point(0, 0)
-    tail = Point(0, 0)
-
-    tail_positions = []
+def simulate_ropes(data: InputT, lengths: Sequence[int]) -> List[int]:
+    # All the ropes follow the same moves, so they are simulated side by side
+    # in a single pass over the input. Returns the tail positions per rope.
+    ropes = [[Point(0, 0) for _ in range(n)] for n in lengths]
+    tail_positions = [set() for _ in lengths]
 
     for dirn, amount in parse_input(data):
         for _ in range(amount):
-            head, tail = move_rope_segment(head, tail, dirn)
-            tail_positions.append(tail)
-
-    return len(set(tail_positions))
-
-def simulate_large_rope(data):
-    knots = [Point(0, 0) for _ in range(10)]
+            for ix, knots in enumerate(ropes):
+                knots = move_rope(knots, dirn)
+                ropes[ix] = knots
+                tail_positions[ix].add(knots[-1])
 
-    tail_positions = []
+    # plot_knots(tail_positions[-1])
+    return [len(positions) for positions in tail_positions]
 
-    for dirn, amount in parse_input(data):
-        for _ in range(amount):
-            knots = move_rope(knots, dirn)
-            tail_positions.append(knots[-1])
+def simulate_small_rope(data: InputT) -> int:
+    return simulate_ropes(data, [2])[0]
 
-    # plot_knots(tail_positions)
-    return len(set(tail_positions))
+def simulate_large_rope(data: InputT) -> int:
+    return simulate_ropes(data, [10])[0]
 
 
-def rope_motion(data: str):
-    yield simulate_small_rope(data)
-    yield simulate_large_rope(data)
+def rope_motion(data: InputT):
+    small, large = simulate_ropes(data, [2, 10])
+    yield small
+    yield large
 
 
 if __name__ == '__main__':
@@ -192,8 +183,6 @@ if __name__ == '__main__':
     assert simulate_large_rope(TEST_DATA_2) == 36
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
-
-    answers = rope_motion(data)
-    print(f'answer_1={next(answers)}')
-    print(f'answer_2={next(answers)}')
+        answers = rope_motion(fp)
+        print(f'answer_1={next(answers)}')
+        print(f'answer_2={next(answers)}')
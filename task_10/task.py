@@ -2,6 +2,7 @@ import os
 
 from typing import List, Iterator, Optional, Tuple
 
+from aoc.streams import InputT, iter_lines
 
 __here__ = os.path.dirname(__file__)
 
@@ -63,8 +64,8 @@ class Computer:
         return view
 
 
-def parse_input(data: str) -> Iterator[Tuple[str, Optional[int]]]:
-    for line in data.splitlines():
+def parse_input(data: InputT) -> Iterator[Tuple[str, Optional[int]]]:
+    for line in iter_lines(data):
         inst = line.split(' ')
         if len(inst) == 2:
             yield inst[0], int(inst[1])
@@ -72,7 +73,7 @@ def parse_input(data: str) -> Iterator[Tuple[str, Optional[int]]]:
             yield inst[0], None
 
 
-def sys_emulator(data: str):
+def sys_emulator(data: InputT):
     computer = Computer()
 
     for instr, arg in parse_input(data):
@@ -88,9 +89,7 @@ if __name__ == '__main__':
     # print(next(test_case))
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
-
-    answers = sys_emulator(data)
-    print(f'answer_1={next(answers)}')
-    print('for answer 2, check output below:')
-    print(next(answers))
+        answers = sys_emulator(fp)
+        print(f'answer_1={next(answers)}')
+        print('for answer 2, check output below:')
+        print(next(answers))
@@ -2,7 +2,7 @@ import re
 import os
 import operator
 
-from typing import List, Iterator, Tuple
+from typing import List, Tuple
 
 
 __here__ = os.path.dirname(__file__)
@@ -39,11 +39,16 @@ class Monkey:
     def catch(self, item):
         self.items.append(item)
 
+    def clone(self) -> 'Monkey':
+        # A fresh monkey holding the starting items. Simulations mutate their
+        # monkeys, so each one runs on clones of the parsed ones.
+        return Monkey(self.index, list(self.items), self.operation, self.destination, self.divisor)
+
     def __repr__(self):
         return f'Monkey {self.index}: {self.items}'
 
 
-def parse_input(data: str) -> Iterator[Monkey]:
+def parse_input(data: str) -> Tuple[Monkey, ...]:
     monkeys = data.split('\n\n')
 
     def parse_monkey(monkey) -> Monkey:
@@ -63,7 +68,7 @@ def parse_input(data: str) -> Iterator[Monkey]:
 
         return Monkey(index, items, operation, destination, divisor)
 
-    yield from map(parse_monkey, monkeys)
+    return tuple(map(parse_monkey, monkeys))
 
 
 def simulate_monkey_biz(monkeys: List[Monkey], rounds: int) -> int:
@@ -97,9 +102,14 @@ def simulate_monkey_biz(monkeys: List[Monkey], rounds: int) -> int:
     return inspections[0] * inspections[1]
 
 
+def solve(monkeys: Tuple[Monkey, ...]):
+    '''Both answers from the output of `parse_input`, each part playing with clones.'''
+    yield simulate_monkey_biz([m.clone() for m in monkeys], rounds=20)
+    yield simulate_monkey_biz([m.clone() for m in monkeys], rounds=10000)
+
+
 def monkey_biz(data: str):
-    yield simulate_monkey_biz(list(parse_input(data)), rounds=20)
-    yield simulate_monkey_biz(list(parse_input(data)), rounds=10000)
+    yield from solve(parse_input(data))
 
 
 if __name__ == '__main__':
@@ -107,6 +117,10 @@ if __name__ == '__main__':
     assert next(test_case) == 10605
     assert next(test_case) == 2713310158
 
+    from aoc.inputs import generate
+    # generated monkeys have to let part 1 finish too, squaring and all.
+    assert all(answer > 0 for answer in monkey_biz(generate('task_11', 50, 0)))
+
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
         data = fp.read()
 
@@ -2,6 +2,9 @@ import os
 import heapq as heap
 
 from collections import defaultdict
+from string import ascii_lowercase
+
+from aoc.grid import Grid
 
 __here__ = os.path.dirname(__file__)
 
@@ -13,25 +16,22 @@ acctuvwj
 abdefghi
 '''
 
-def gen_neighbors(array, x, y):
-    '''Generated value and coordinates in NSWE directions.'''
-    dirs = [
-        (x - 1, y),
-        (x + 1, y),
-        (x, y - 1),
-        (x, y + 1),
-    ]
-    sx = len(array)
-    sy = len(array[0])
-    my_value = array[x][y]
-
-    for x, y in dirs:
-        if not(0 <= x < sx and 0 <= y < sy):
-            # bounds check
-            continue
-        neighbor = array[x][y]
+# Elevations a..z become 0..25, the start and the destination are a and z.
+ELEVATIONS = bytes.maketrans(
+    (ascii_lowercase + 'SE').encode(),
+    bytes(range(26)) + bytes([0, 25]),
+)
+
+
+def gen_neighbors(grid, node):
+    '''Generated value and flat index of reachable cells in NSWE directions.'''
+    cells = grid.cells
+    my_value = cells[node]
+
+    for ix in grid.neighbors(node):
+        neighbor = cells[ix]
         if neighbor <= my_value + 1:
-            yield neighbor, (x, y)
+            yield neighbor, ix
 
 
 def reconstruct_paths(predecessors, source, target):
@@ -63,10 +63,11 @@ def dijkstra(weights, start_node, end_node):
     # Taken from my solution to task 15 of 2021's challenge.
     # Kind of modified to ignore "cost", since we are interested in stride costs
     # only.
-    visited = set()
+    # nodes are flat indexes into the grid, so per-node state fits in arrays.
+    visited = bytearray(len(weights.cells))
     parents_map = {}
     pq = []
-    node_costs = defaultdict(lambda: float('inf'))
+    node_costs = [float('inf')] * len(weights.cells)
     node_costs[start_node] = 0
     heap.heappush(pq, (0, start_node))
 
@@ -75,10 +76,10 @@ def dijkstra(weights, start_node, end_node):
         _, node = heap.heappop(pq)
         if node == end_node:
             break
-        visited.add(node)
+        visited[node] = 1
 
-        for _, adj_node in gen_neighbors(weights, node[0], node[1]):
-            if adj_node in visited:
+        for _, adj_node in gen_neighbors(weights, node):
+            if visited[adj_node]:
                 continue
 
             new_cost = node_costs[node] + 1     # the path weight is increased by one,
@@ -92,34 +93,21 @@ def dijkstra(weights, start_node, end_node):
 
 
 def parse_input(data: str):
-    space = [list(line) for line in data.splitlines()]
-    x_span = len(space)
-    y_span = len(space[0])
-
-    # We transform the elevation map into a grid-graph.
-    graph = []
-    start = None
-    dest = None
-
-    for x in range(x_span):
-        row = []
-        for y in range(y_span):
-            elevation = space[x][y]
-            if elevation == 'S':
-                start = (x, y)
-                elevation = 'a'
-            elif elevation == 'E':
-                dest = (x, y)
-                elevation = 'z'
-
-            row.append(ord(elevation) - ord('a'))
-        graph.append(row)
+    lines = data.splitlines()
+    flat = ''.join(lines)
+
+    # We transform the elevation map into a grid-graph, nodes are the flat
+    # indexes of its cells.
+    graph = Grid.from_lines(lines, table=ELEVATIONS)
+    start = flat.index('S')
+    dest = flat.index('E')
 
     return graph, start, dest
 
 
-def shitty_signals(data: str):
-    graph, start, dest = parse_input(data)
+def solve(model):
+    '''Both answers from the output of `parse_input`.'''
+    graph, start, dest = model
 
     predecessors, _ = dijkstra(graph, start, dest)
     paths = reconstruct_paths(predecessors, start, dest)
@@ -127,12 +115,7 @@ def shitty_signals(data: str):
     yield min(map(len, paths))
 
     # for part 2, find all the points where weight == 0.
-    start_points = []
-
-    for x, row in enumerate(graph):
-        for y, cell in enumerate(row):
-            if cell == 0:
-                start_points.append((x, y))
+    start_points = list(graph.find(0))
 
     shortest_path_lens = []
 
@@ -148,6 +131,10 @@ def shitty_signals(data: str):
     yield min(shortest_path_lens)
 
 
+def shitty_signals(data: str):
+    yield from solve(parse_input(data))
+
+
 if __name__ == '__main__':
     test_case = shitty_signals(TEST_DATA)
     assert next(test_case) == 31
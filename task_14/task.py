@@ -4,7 +4,8 @@ import os
 
 from enum import Enum
 from collections import namedtuple
-from typing import Dict
+
+from aoc.grid import Grid
 
 __here__ = os.path.dirname(__file__)
 
@@ -24,55 +25,108 @@ class Shape(Enum):
     sand = 'o'   # just a flick of sand...
     source = '+'
 
+# Cells of the board hold the byte of their shape's character.
+SHAPES = {ord(shape.value): shape for shape in Shape}
+AIR = ord(Shape.air.value)
+
+
 class Board:
+    '''
+    The cave, backed by a grid that grows as shapes are placed. Points never
+    set are air, as is anything outside of the grid.
+    '''
     def __init__(self, source: Point):
-        self.space: Dict[Point, Shape] = {}
-        self.space[source] = Shape.source
+        self.grid = Grid(1, 1, fill=AIR)
+        self.x0, self.y0 = source    # point at the grid's top left cell
         self.source = source
         self.floor = None
 
+        # Kept up to date on every write, so that none of these need a scan.
+        self._span = BoardSpan(source.x, source.x, source.y, source.y)
+        self._deepest_rock = None
+        self._sand_count = 0
+
+        self[source] = Shape.source
+
+    def _index(self, key: Point):
+        r, c = key.y - self.y0, key.x - self.x0
+        if 0 <= r < self.grid.n_rows and 0 <= c < self.grid.n_cols:
+            return r * self.grid.n_cols + c
+        return None
+
+    def _grow(self, key: Point):
+        # Grow to fit the point, with some slack so that growing is rare.
+        old = self.grid
+        pad_x, pad_y = old.n_cols // 2 + 1, old.n_rows // 2 + 1
+        x_min = min(self.x0, key.x - pad_x)
+        x_max = max(self.x0 + old.n_cols - 1, key.x + pad_x)
+        y_min = min(self.y0, key.y - pad_y)
+        y_max = max(self.y0 + old.n_rows - 1, key.y + pad_y)
+
+        grid = Grid(y_max - y_min + 1, x_max - x_min + 1, fill=AIR)
+        dx, dy = self.x0 - x_min, self.y0 - y_min
+        for r in range(old.n_rows):
+            start = grid.index(r + dy, dx)
+            grid.cells[start:start + old.n_cols] = old.row(r)
+
+        self.grid = grid
+        self.x0, self.y0 = x_min, y_min
+
     def __getitem__(self, key: Point) -> Shape:
-        try:
-            if self.floor is not None and key.y == self.floor:
-                return Shape.rock
-            return self.space[key]
-        except KeyError:
+        if self.floor is not None and key.y == self.floor:
+            return Shape.rock
+        ix = self._index(key)
+        if ix is None:
             return Shape.air
+        return SHAPES[self.grid.cells[ix]]
 
     def __setitem__(self, key: Point, value: Shape):
-        self.space[key] = value
+        ix = self._index(key)
+        if ix is None:
+            self._grow(key)
+            ix = self._index(key)
+
+        if self.grid.cells[ix] == ord(Shape.sand.value):
+            self._sand_count -= 1
+        if value == Shape.sand:
+            self._sand_count += 1
+        if value == Shape.rock and (self._deepest_rock is None or key.y > self._deepest_rock):
+            self._deepest_rock = key.y
+
+        self.grid.cells[ix] = ord(value.value)
+
+        s = self._span
+        if not (s.x_min <= key.x <= s.x_max and s.y_min <= key.y <= s.y_max):
+            self._span = BoardSpan(
+                min(s.x_min, key.x), max(s.x_max, key.x),
+                min(s.y_min, key.y), max(s.y_max, key.y),
+            )
 
     @property
     def span(self) -> BoardSpan:
-        # what's the horizontal and vertical range?
-        pts = [*self.space.keys(), self.source]
-        x = [pt.x for pt in pts]
-        y = [pt.y for pt in pts]
-        return BoardSpan(min(x), max(x), min(y), max(y))
+        # what's the horizontal and vertical range of everything ever placed?
+        return self._span
 
     @property
     def deepest_rock(self) -> int:
-        rock_levels = [pt.y for pt, shape in self.space.items() if shape == Shape.rock]
-        return max(rock_levels)
+        return self._deepest_rock
 
     def show(self) -> str:
         span = self.span
-        canvas = [[
-            Shape.air.value
-            for _ in range(span.x_min, span.x_max + 1)]
-            for _ in range(span.y_min, span.y_max + 1)
-        ]
-        for pt, shape in self.space.items():
-            canvas[pt.y - span.y_min][pt.x - span.x_min] = shape.value
+        width = span.x_max - span.x_min + 1
+        canvas = []
+        for y in range(span.y_min, span.y_max + 1):
+            start = self._index(Point(span.x_min, y))
+            canvas.append(self.grid.cells[start:start + width].decode())
 
-        return '\n'.join([''.join(row) for row in canvas])
+        return '\n'.join(canvas)
 
     def set_floor(self, level):
         self.floor = level
 
     @property
     def sand_count(self):
-        return len([pt for pt, shape in self.space.items() if shape == Shape.sand])
+        return self._sand_count
 
 
 def iter_path(a: Point, b: Point):
@@ -4,9 +4,6 @@ import re
 
 from typing import Iterator, NamedTuple
 
-from shapely import Polygon
-from shapely.ops import unary_union, clip_by_rect
-
 
 __here__ = os.path.dirname(__file__)
 
@@ -67,6 +64,9 @@ class Region(NamedTuple):
 
     @property
     def polygon(self):
+        # shapely is slow to import and only part 2 needs it.
+        from shapely import Polygon
+
         s = self.span
         o = self.origin
         return Polygon([
@@ -116,6 +116,8 @@ def beacon_sensor(data: str, y: int):
     # merged together to form a planar region. This region then is intersected
     # with a bounding box. Within this region, we will have hole corresponding
     # to the beacon not received by other sensors.
+    from shapely.ops import unary_union, clip_by_rect
+
     rmax = 4_000_000
 
     all_regions = unary_union([r.polygon for r in regions])
@@ -49,10 +49,8 @@ def parse_input(data: str) -> tuple[dict, dict]:
     return scalars, expressions
 
 
-def broken_calculator(data: str) -> int:
-    # Part 1
-    scalars, expressions = parse_input(data)
-
+def broken_calculator(scalars: dict, expressions: dict) -> int:
+    # Part 1. Note: modifies the dicts in place!
     while 'root' not in scalars:
         # keep simplifying the expressions.
         for monkey, exp in expressions.copy().items():
@@ -65,16 +63,15 @@ def broken_calculator(data: str) -> int:
     return int(scalars['root'])
 
 
-def working_calculator(data: str) -> int:
+def working_calculator(scalars: dict, expressions: dict) -> int:
     # Part 2: find what causes the equation root to be true. The two while
-    # loops may be merged.
+    # loops may be merged. Note: modifies the dicts in place too!
     try:
         from sympy import Symbol
         from sympy.solvers import solve
     except ImportError:
         print('[!] Part 2 requires sympy.')
         return 301 # default input
-    scalars, expressions = parse_input(data)
     # know that monkey, you, `humn` is no longer speaking.
     del scalars['humn']
     root = expressions['root']
@@ -119,9 +116,16 @@ def working_calculator(data: str) -> int:
     return int(soln)
 
 
+def solve(model: tuple[dict, dict]):
+    '''Both answers from the output of `parse_input`, which is left untouched.'''
+    scalars, expressions = model
+    # expressions are immutable, shallow copies of the dicts are enough.
+    yield broken_calculator(dict(scalars), dict(expressions))
+    yield working_calculator(dict(scalars), dict(expressions))
+
+
 def monkey_calculator(data: str):
-    yield broken_calculator(data)
-    yield working_calculator(data)
+    yield from solve(parse_input(data))
 
 
 if __name__ == '__main__':
@@ -5,6 +5,8 @@ import time
 
 from typing import NamedTuple
 
+from aoc.grid import Grid
+
 __here__ = os.path.dirname(__file__)
 
 TEST_DATA = '''\
@@ -26,6 +28,7 @@ TEST_DATA = '''\
 
 OPEN = '.'
 CLOSED = '#'
+VOID = ' '
 
 class Pt(NamedTuple):
     r: int  # row
@@ -63,42 +66,48 @@ DARROWS = {
 }
 
 
-def parse_input(data: str) -> tuple[dict, list]:
+def parse_input(data: str) -> tuple[Grid, list]:
     mmap, path = data.split('\n\n')
-    mhash = {}
-
-    for r, row in enumerate(mmap.splitlines()):
-        for c, cell in enumerate(row):
-            if cell == ' ':
-                continue
-            # add cell to map.
-            mhash[Pt(r, c)] = cell
+    # cells hold their character, the ragged rows are padded with void.
+    mgrid = Grid.from_lines(mmap.splitlines(), fill=ord(VOID))
 
     path = re.split(r'([RL])', path)
     path[::2] = map(int, path[::2])
 
-    return mhash, path
+    return mgrid, path
 
 
 class MonkeyMap:
-    def __init__(self, mhash: dict[Pt, str]):
-        self.mmap = self.preload(mhash)
+    def __init__(self, mgrid: Grid):
+        self.mmap = self.preload(mgrid)
         self.path = []
 
-    def preload(self, mhash):
-        pts = mhash.keys()
-        origin = min(pts)
-        assert mhash[origin] == OPEN
-        self.pos = Pos(*origin, 0)   # begin facing right, so f=0
+    def preload(self, mgrid):
+        void = ord(VOID)
 
         # set the bounds.
-        rows, cols = zip(*pts)
-        self.row_min = min(rows)
-        self.row_max = max(rows)
-        self.col_min = min(cols)
-        self.col_max = max(cols)
+        self.row_min = 0
+        self.row_max = mgrid.n_rows - 1
+        self.col_min = 0
+        self.col_max = mgrid.n_cols - 1
+
+        # The map has no holes, so each row and column is one run of tiles.
+        # Their ends are where we wrap around to.
+        def tile_span(line):
+            tiles = [ix for ix, cell in enumerate(line) if cell != void]
+            return tiles[0], tiles[-1]
+
+        self.row_spans = [tile_span(mgrid.row(r)) for r in range(mgrid.n_rows)]
+        self.col_spans = [tile_span(mgrid.col(c)) for c in range(mgrid.n_cols)]
+
+        origin = Pt(0, self.row_spans[0][0])
+        assert chr(mgrid[origin]) == OPEN
+        self.pos = Pos(*origin, 0)   # begin facing right, so f=0
+
+        return mgrid
 
-        return mhash
+    def __contains__(self, pt: Pt) -> bool:
+        return self.mmap.get(pt.r, pt.c, ord(VOID)) != ord(VOID)
 
     def move(self, step):
         if type(step) == str:
@@ -125,24 +134,23 @@ class MonkeyMap:
 
         next_pos = p.point + step
 
-        if next_pos not in self.mmap:
+        if next_pos not in self:
             # next point is then a void. we need to find the wrap-around point.
             # thankfully the map does not contain holes, so we are safer.
-            # find the opposite point in the direction.
-            # get current row and col coords.
-            row = [pt for pt in self.mmap.keys() if pt.c == p.c]
-            col = [pt for pt in self.mmap.keys() if pt.r == p.r]
+            # find the opposite end of the current row or column.
+            row_first, row_last = self.row_spans[p.r]
+            col_first, col_last = self.col_spans[p.c]
 
             if p.f == 0:
-                next_pos = min(col)
+                next_pos = Pt(p.r, row_first)
             if p.f == 1:
-                next_pos = min(row)
+                next_pos = Pt(col_first, p.c)
             if p.f == 2:
-                next_pos = max(col)
+                next_pos = Pt(p.r, row_last)
             if p.f == 3:
-                next_pos = max(row)
+                next_pos = Pt(col_last, p.c)
 
-        if self.mmap[next_pos] == OPEN:
+        if chr(self.mmap[next_pos]) == OPEN:
             # we can step here! so we do it
             return Pos(*next_pos, p.f)
         else:
@@ -154,8 +162,8 @@ class MonkeyMap:
             [' ' for _ in range(self.col_min, self.col_max + 1)]
             for _ in range(self.row_min, self.row_max + 1)]
 
-        for pt, cell in self.mmap.items():
-            screen[pt.r][pt.c] = cell
+        for r in range(self.mmap.n_rows):
+            screen[r] = list(self.mmap.row(r).tobytes().decode())
 
         for pt in self.path:
             screen[pt.r][pt.c] = f'\033[32m{DARROWS[pt.f]}\033[0m'
@@ -182,10 +190,11 @@ class Cube:
         pass
 
 
-def monkeypass(data: str, debug=False):
-    mhash, path = parse_input(data)
+def solve(model: tuple[Grid, list], debug=False):
+    '''The answer from the output of `parse_input`.'''
+    mgrid, path = model
 
-    mmap = MonkeyMap(mhash)
+    mmap = MonkeyMap(mgrid)
 
     for step in path:
         mmap.move(step)
@@ -198,6 +207,10 @@ def monkeypass(data: str, debug=False):
     yield 1000 * (mmap.pos.r + 1) + 4 * (mmap.pos.c + 1) + mmap.pos.f
 
 
+def monkeypass(data: str, debug=False):
+    yield from solve(parse_input(data), debug=debug)
+
+
 if __name__ == '__main__':
     test_case = monkeypass(TEST_DATA, debug=True)
     assert next(test_case) == 6032
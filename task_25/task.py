@@ -1,5 +1,7 @@
 import os
 
+from aoc.streams import InputT, iter_lines
+
 __here__ = os.path.dirname(__file__)
 
 TEST_DATA = '''\
@@ -58,8 +60,8 @@ def int_to_snafu(num: int) -> str:
     return ''.join(snafu[::-1])
 
 
-def double_minus(data: str, debug=False):
-    fuel_level = sum(map(snafu_to_int, data.splitlines()))
+def double_minus(data: InputT, debug=False):
+    fuel_level = sum(map(snafu_to_int, iter_lines(data)))
     yield int_to_snafu(fuel_level)
 
 
@@ -68,7 +70,5 @@ if __name__ == '__main__':
     assert next(test_case) == '2=-1=0'
 
     with open(os.path.join(__here__, 'input.txt'), 'r') as fp:
-        data = fp.read()
-
-    answers = double_minus(data)
-    print(f'answer_1=\033[32m{next(answers)}\033[0m')
+        answers = double_minus(fp)
+        print(f'answer_1=\033[32m{next(answers)}\033[0m')